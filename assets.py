@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap
+
+
+CHOICE_IMAGES = ("rock", "paper", "scissors", "question")
+
+
+class PixmapCache:
+    """Choice images loaded from disk once, plus pre-scaled variants keyed by (name, size, device pixel ratio).
+
+    Scaled variants are kept in LRU order; the least recently used ones are
+    evicted beyond `max_entries`, and discard_size() drops a size that is no
+    longer on screen. Must only be used from the GUI thread.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._originals = {}
+        self._scaled = OrderedDict()
+
+    @staticmethod
+    def image_name(choice):
+        return choice.lower() if choice else "question"
+
+    def original(self, name):
+        pixmap = self._originals.get(name)
+        if pixmap is None:
+            pixmap = QPixmap(f"{name}.png")
+            self._originals[name] = pixmap
+        return pixmap
+
+    def get(self, choice, width, height, device_pixel_ratio=1.0):
+        """Returns the image for a choice ("Rock", ... or None) scaled to fit width x height logical pixels."""
+        key = (self.image_name(choice), width, height, device_pixel_ratio)
+        pixmap = self._scaled.get(key)
+        if pixmap is not None:
+            self._scaled.move_to_end(key)
+            return pixmap
+
+        pixmap = self.original(key[0]).scaled(int(width * device_pixel_ratio), int(height * device_pixel_ratio),
+                                              Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        self._scaled[key] = pixmap
+        while len(self._scaled) > self.max_entries:
+            self._scaled.popitem(last=False)
+        return pixmap
+
+    def preload(self, width, height, device_pixel_ratio=1.0):
+        for name in CHOICE_IMAGES:
+            self.get(name, width, height, device_pixel_ratio)
+
+    def discard_size(self, width, height):
+        for key in [key for key in self._scaled if key[1:3] == (width, height)]:
+            del self._scaled[key]
@@ -0,0 +1,196 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import cv2
+
+from frame_sources import create_frame_source
+from hand_tracking import HandTrackingThread
+
+
+STAGES = ("read", "flip", "cvtColor", "hands.process", "detect_gesture", "display")
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize(samples):
+    """Turns raw per-stage durations (seconds) into millisecond statistics."""
+    values = sorted(samples)
+    total = sum(values)
+    return {
+        "count": len(values),
+        "mean_ms": total / len(values) * 1000 if values else 0.0,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": values[-1] * 1000 if values else 0.0,
+        "total_s": total,
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(source, max_frames=None, warmup_frames=10, roi_tracking=False, backend="solutions",
+                  hand_model_path="hand_landmarker.task"):
+    """Runs the HandTrackingThread stages one by one over a frame source and times each of them.
+
+    With the "tasks" backend, hands.process is the time spent submitting a
+    frame and collecting whatever results have come back meanwhile, which is
+    what the tracking loop waits for; the hands of a frame may arrive while
+    a later frame is being timed.
+    """
+    inference_client = None
+    if backend == "tasks":
+        from tasks_backend import LiveStreamHandLandmarker
+        inference_client = LiveStreamHandLandmarker(hand_model_path)
+    tracker = HandTrackingThread(source, roi_tracking=roi_tracking, inference_client=inference_client)
+    tracker.load_model()
+    samples = {stage: [] for stage in STAGES}
+    frame_times = []
+    frames = 0
+    clock = time.perf_counter
+
+    if not source.open():
+        raise RuntimeError("Could not open frame source")
+    try:
+        while max_frames is None or frames < max_frames + warmup_frames:
+            t0 = clock()
+            ret, frame = source.read()
+            t1 = clock()
+            if not ret:
+                break
+
+            frame = cv2.flip(frame, 1)
+            t2 = clock()
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            t3 = clock()
+            if inference_client:
+                inference_client.submit(rgb_frame, (t0, frames + 1))
+                hands = [hand for _, _, frame_hands in inference_client.completed(tracker.find_hands)
+                         for hand in frame_hands]
+            else:
+                hands = tracker.find_hands(rgb_frame)
+            t4 = clock()
+
+            gesture_time = 0.0
+            for points, _, _ in hands:
+                d0 = clock()
+                tracker.detect_gesture(points)
+                gesture_time += clock() - d0
+
+            t5 = clock()
+            display_frame = tracker.render_display_frame(rgb_frame)
+            t6 = clock()
+            # Landmarks are painted by the GUI (VideoWidget), not on the worker
+            display_frame.release()
+
+            frames += 1
+            if frames <= warmup_frames:
+                continue  # Model and caches are still warming up
+            samples["read"].append(t1 - t0)
+            samples["flip"].append(t2 - t1)
+            samples["cvtColor"].append(t3 - t2)
+            samples["hands.process"].append(t4 - t3)
+            samples["detect_gesture"].append(gesture_time)
+            samples["display"].append(t6 - t5)
+            frame_times.append(t6 - t0)
+    finally:
+        source.release()
+        if tracker.hands:
+            tracker.hands.close()
+        if inference_client:
+            inference_client.close()
+
+    measured = len(frame_times)
+    wall = sum(frame_times)
+    roi_tracker = tracker.roi_tracker
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "frames": measured,
+        "warmup_frames": warmup_frames,
+        "roi_tracking": roi_tracking,
+        # How often the crop moved or lost the hand; both mean a full palm detection
+        "roi": {"box_moves": roi_tracker.moves, "misses": roi_tracker.misses} if roi_tracker else None,
+        "backend": backend,
+        "throughput_fps": measured / wall if wall else 0.0,
+        "frame": summarize(frame_times),
+        "stages": {stage: summarize(values) for stage, values in samples.items()},
+    }
+
+
+def compare(report, baseline, threshold):
+    """Prints stages whose p95 regressed by more than `threshold` (a fraction) against a baseline report."""
+    regressions = []
+    for stage, stats in report["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not before["p95_ms"]:
+            continue
+        change = stats["p95_ms"] / before["p95_ms"] - 1.0
+        marker = "REGRESSION" if change > threshold else ""
+        print(f"{stage:>16}: p95 {before['p95_ms']:8.3f} -> {stats['p95_ms']:8.3f} ms ({change:+.1%}) {marker}")
+        if change > threshold:
+            regressions.append(stage)
+    return regressions
+
+
+def print_report(report):
+    print(f"{report['frames']} frames, {report['throughput_fps']:.1f} FPS")
+    print(f"{'stage':>16} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}  (ms)")
+    for stage, stats in list(report["stages"].items()) + [("frame", report["frame"])]:
+        print(f"{stage:>16} {stats['mean_ms']:8.3f} {stats['p50_ms']:8.3f} {stats['p95_ms']:8.3f} {stats['p99_ms']:8.3f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-stage latency benchmark for the hand-tracking pipeline")
+    parser.add_argument("source", help="video file, image directory, camera index or 'synthetic'")
+    parser.add_argument("--frames", type=int, default=None, help="stop after this many measured frames")
+    parser.add_argument("--warmup", type=int, default=10, help="frames to run before measuring")
+    parser.add_argument("--realtime", action="store_true", help="replay at native FPS instead of as fast as possible")
+    parser.add_argument("--roi", action="store_true", help="run inference on a crop around the last known hand")
+    parser.add_argument("--backend", choices=("solutions", "tasks"), default="solutions",
+                        help="hand tracking backend to measure")
+    parser.add_argument("--hand-model", default="hand_landmarker.task", metavar="PATH",
+                        help="hand landmarker model file for --backend tasks")
+    parser.add_argument("--output", default="bench_output.json", help="where to write the JSON report")
+    parser.add_argument("--baseline", help="JSON report of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="p95 slowdown treated as a regression")
+    args = parser.parse_args(argv)
+    if args.roi and args.backend == "tasks":
+        parser.error("--roi only applies to the solutions backend")
+
+    source = create_frame_source(args.source, realtime=args.realtime)
+    if args.source == "synthetic" and args.frames is None:
+        args.frames = 300  # The synthetic source never ends on its own
+    report = run_benchmark(source, max_frames=args.frames, warmup_frames=args.warmup,
+                           roi_tracking=args.roi, backend=args.backend, hand_model_path=args.hand_model)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import threading
+import time
+
+from tracing import tracer
+
+
+class LatestFrameBuffer:
+    """Single-slot buffer where a new item replaces any item nobody has taken yet.
+
+    Readers always get the newest item; replaced items are counted in `dropped`.
+    """
+
+    def __init__(self, on_drop=None):
+        self._cond = threading.Condition()
+        self._item = None
+        self._has_item = False
+        self.closed = False
+        self.dropped = 0
+        self.on_drop = on_drop  # Called with every item that was replaced unread
+
+    def put(self, item):
+        """Stores an item; returns True if it replaced one nobody had taken yet."""
+        with self._cond:
+            replaced = self._item if self._has_item else None
+            was_full = self._has_item
+            if was_full:
+                self.dropped += 1
+            self._item = item
+            self._has_item = True
+            self._cond.notify()
+        if replaced is not None and self.on_drop:
+            self.on_drop(replaced)
+        return was_full
+
+    def get(self, timeout=None):
+        """Waits for an item; returns None on timeout or once the buffer is closed and empty."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._has_item or self.closed, timeout):
+                return None
+            return self._pop()
+
+    @property
+    def pending(self):
+        # 1 while an item is waiting to be taken, else 0
+        return int(self._has_item)
+
+    def take(self):
+        """Returns the pending item without waiting, or None."""
+        with self._cond:
+            return self._pop()
+
+    def _pop(self):
+        item = self._item if self._has_item else None
+        self._item = None
+        self._has_item = False
+        return item
+
+    def clear(self):
+        with self._cond:
+            cleared = self._pop()
+        if cleared is not None and self.on_drop:
+            self.on_drop(cleared)
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class CaptureThread(threading.Thread):
+    """Reads frames from a source as fast as it delivers them into a LatestFrameBuffer.
+
+    Items are (frame, capture time, frame ID); IDs count up from 1. Frames
+    replaced unread are counted per scheduler mode in `dropped_by_mode`:
+    PREVIEW skips most frames on purpose, only FULL drops mean inference
+    cannot keep up.
+    """
+
+    def __init__(self, source, frame_buffer, scheduler=None):
+        super().__init__(name="capture", daemon=True)
+        self.source = source
+        self.frame_buffer = frame_buffer
+        self.scheduler = scheduler  # Optional InferenceScheduler; capture stops while it is paused
+        self.error = None
+        self.frames_captured = 0
+        self.dropped_by_mode = {}
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                if self.scheduler and self.scheduler.wait_while_paused(timeout=0.5) == self.scheduler.PAUSED:
+                    continue
+                started = time.perf_counter()
+                ret, frame = self.source.read()
+                if not ret:
+                    if not self.source.end_of_stream:  # End of a recording is not an error
+                        self.error = "Error reading frame."
+                    break
+                self.frames_captured += 1
+                captured_at = time.perf_counter()
+                tracer.complete("capture", started, captured_at, self.frames_captured, flow="s")
+                if self.frame_buffer.put((frame, captured_at, self.frames_captured)):
+                    mode = self.scheduler.mode if self.scheduler else None
+                    self.dropped_by_mode[mode] = self.dropped_by_mode.get(mode, 0) + 1
+        except Exception as e:
+            self.error = f"Error in capture thread: {str(e)}"
+        finally:
+            self.frame_buffer.close()
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,150 @@
+import threading
+import time
+
+import numpy as np
+from PyQt5.QtCore import QLineF, QPointF, Qt
+from PyQt5.QtGui import QBrush, QColor, QFont, QImage, QPainter, QPen
+from PyQt5.QtWidgets import QLabel
+
+from tracing import tracer
+
+
+# Bones of MediaPipe's 21-point hand model (mp.solutions.hands.HAND_CONNECTIONS)
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+
+class DisplayFrame:
+    """A display-sized RGB frame living in a FrameBufferPool buffer.
+
+    `image` is a QImage that wraps `array` without copying it, so the frame
+    must be released back to the pool once the GUI no longer shows it.
+    """
+
+    def __init__(self, pool, index, array):
+        self.pool = pool
+        self.index = index
+        self.array = array
+        self.frame_id = -1  # Captured frame shown in this buffer, for tracing
+        self.captured_at = 0.0
+        self.hands = ()  # (21, 3) arrays of normalized landmarks, painted over the frame by VideoWidget
+        height, width, channel = array.shape
+        self.image = QImage(array.data, width, height, 3 * width, QImage.Format_RGB888)
+
+    def release(self):
+        self.pool.release(self)
+
+
+class FrameBufferPool:
+    """A few preallocated display buffers shared between the tracking thread and the GUI."""
+
+    def __init__(self, width, height, count=3):
+        self.width = width
+        self.height = height
+        self._lock = threading.Lock()
+        self.frames = [DisplayFrame(self, index, np.zeros((height, width, 3), dtype=np.uint8))
+                       for index in range(count)]
+        self._free = list(self.frames)
+
+    def acquire(self):
+        """Returns a free frame, or None when the GUI still holds every buffer."""
+        with self._lock:
+            return self._free.pop() if self._free else None
+
+    def release(self, frame):
+        with self._lock:
+            if frame not in self._free:
+                self._free.append(frame)
+
+
+def fit_size(width, height, max_width, max_height):
+    """Largest size with the aspect ratio of width x height that fits into max_width x max_height."""
+    scale = min(max_width / width, max_height / height)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+class VideoWidget(QLabel):
+    """Shows DisplayFrames by blitting them; no QPixmap conversion or scaling on the GUI thread.
+
+    Hand skeletons are painted as vectors over the blitted frame, so they
+    never touch the frame pixels; with show_landmarks off they are skipped.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.frame = None
+        self.painted_frame_id = None
+        self.show_landmarks = True
+        # Built once; paintEvent runs at display rate
+        self.bone_pen = QPen(QColor(128, 128, 128), 1)
+        self.joint_pen = QPen(Qt.NoPen)
+        self.joint_brush = QBrush(QColor(255, 255, 255))
+
+    def set_landmarks_visible(self, visible):
+        self.show_landmarks = visible
+        self.update()
+
+    def set_frame(self, frame):
+        previous = self.frame
+        self.frame = frame
+        if previous is not None and previous is not frame:
+            previous.release()
+        self.update()
+
+    def clear_frame(self):
+        self.set_frame(None)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)  # Border and background from the stylesheet
+        if self.frame is None:
+            return
+        started = time.perf_counter()
+        image = self.frame.image
+        rect = self.contentsRect()
+        left = rect.x() + (rect.width() - image.width()) // 2
+        top = rect.y() + (rect.height() - image.height()) // 2
+        painter = QPainter(self)
+        painter.drawImage(left, top, image)
+        if self.show_landmarks and self.frame.hands:
+            self.paint_hands(painter, self.frame.hands, left, top, image.width(), image.height())
+        painter.end()
+        if tracer.enabled and self.frame.frame_id != self.painted_frame_id:
+            # First paint of a frame ends its flow: capture-to-screen latency
+            self.painted_frame_id = self.frame.frame_id
+            tracer.complete("paint", started, frame_id=self.frame.frame_id, flow="f",
+                            latency_ms=round((time.perf_counter() - self.frame.captured_at) * 1000, 2))
+
+
+    def paint_hands(self, painter, hands, left, top, width, height):
+        painter.setRenderHint(QPainter.Antialiasing)
+        for points in hands:
+            # Landmarks are normalized to the frame, so they scale straight onto the image rect
+            pixels = (points[:, :2] * (width, height) + (left, top)).tolist()
+            painter.setPen(self.bone_pen)
+            painter.drawLines([QLineF(*pixels[start], *pixels[end]) for start, end in HAND_CONNECTIONS])
+            painter.setPen(self.joint_pen)
+            painter.setBrush(self.joint_brush)
+            for x, y in pixels:
+                painter.drawEllipse(QPointF(x, y), 2.5, 2.5)
+
+
+class MetricsOverlay(QLabel):
+    """Pipeline metrics drawn over the top-left corner of a VideoWidget."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setFont(QFont("Consolas", 9))
+        self.setStyleSheet("color: white; background-color: rgba(0, 0, 0, 160); border: none; "
+                           "border-radius: 6px; padding: 4px;")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.move(10, 10)
+        self.hide()
+
+    def show_text(self, text):
+        self.setText(text)
+        self.adjustSize()
@@ -0,0 +1,199 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource:
+    """Base class for everything HandTrackingThread can read frames from.
+
+    The interface mirrors cv2.VideoCapture (isOpened/read/release) so the
+    tracking loop does not care whether frames come from a camera or a file.
+    """
+
+    def __init__(self, realtime=True):
+        self.realtime = realtime  # False replays as fast as possible
+        self.fps = 0.0
+        self.end_of_stream = False
+        self._next_frame_time = None
+
+    def open(self):
+        raise NotImplementedError
+
+    def isOpened(self):
+        raise NotImplementedError
+
+    def read(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def _pace(self):
+        # Sleep until the frame is due when replaying at native FPS
+        if not self.realtime or self.fps <= 0:
+            return
+        now = time.perf_counter()
+        if self._next_frame_time is None or now - self._next_frame_time > 1.0 / self.fps:
+            self._next_frame_time = now  # First frame, or we fell behind: don't burst
+        elif self._next_frame_time > now:
+            time.sleep(self._next_frame_time - now)
+        self._next_frame_time += 1.0 / self.fps
+
+
+class CameraSource(FrameSource):
+    def __init__(self, index=0):
+        super().__init__(realtime=True)
+        self.index = index
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.index)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Don't let the driver queue up stale frames
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 0.0
+        return self.cap.isOpened()
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self):
+        # The camera paces itself, no need to sleep
+        return self.cap.read()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, realtime=True, loop=False):
+        super().__init__(realtime=realtime)
+        self.path = path
+        self.loop = loop
+        self.cap = None
+
+    def open(self):
+        self.end_of_stream = False
+        self._next_frame_time = None
+        self.cap = cv2.VideoCapture(self.path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        return self.cap.isOpened()
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            self.end_of_stream = True
+            return False, None
+        self._pace()
+        return True, frame
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class ImageSequenceSource(FrameSource):
+    def __init__(self, directory, fps=30.0, realtime=True, loop=False):
+        super().__init__(realtime=realtime)
+        self.directory = directory
+        self.fps = fps
+        self.loop = loop
+        self.paths = []
+        self.position = 0
+        self.opened = False
+
+    def open(self):
+        self.end_of_stream = False
+        self._next_frame_time = None
+        self.position = 0
+        if not os.path.isdir(self.directory):
+            self.paths = []
+            return False
+        self.paths = sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self.opened = bool(self.paths)
+        return self.opened
+
+    def isOpened(self):
+        return self.opened and not self.end_of_stream
+
+    def read(self):
+        while self.opened:
+            if self.position >= len(self.paths):
+                if not self.loop:
+                    break
+                self.position = 0
+            frame = cv2.imread(self.paths[self.position])
+            self.position += 1
+            if frame is not None:  # Skip files OpenCV cannot decode
+                self._pace()
+                return True, frame
+        self.end_of_stream = True
+        return False, None
+
+    def release(self):
+        self.opened = False
+
+
+class SyntheticSource(FrameSource):
+    """Generates a deterministic moving blob, useful on machines without a camera."""
+
+    def __init__(self, width=640, height=480, fps=30.0, num_frames=None, realtime=True):
+        super().__init__(realtime=realtime)
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.num_frames = num_frames  # None means endless
+        self.frame_index = 0
+        self.background = None
+
+    def open(self):
+        self.end_of_stream = False
+        self._next_frame_time = None
+        self.frame_index = 0
+        gradient = np.linspace(0, 255, self.width, dtype=np.uint8)
+        self.background = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self.background[:] = gradient[None, :, None]
+        return True
+
+    def isOpened(self):
+        return self.background is not None and not self.end_of_stream
+
+    def read(self):
+        if self.num_frames is not None and self.frame_index >= self.num_frames:
+            self.end_of_stream = True
+            return False, None
+        frame = self.background.copy()
+        phase = self.frame_index / max(self.fps, 1.0)
+        center = (int(self.width / 2 + self.width / 3 * np.sin(phase)),
+                  int(self.height / 2 + self.height / 4 * np.cos(phase * 0.7)))
+        cv2.circle(frame, center, min(self.width, self.height) // 8, (60, 140, 220), -1)
+        self.frame_index += 1
+        self._pace()
+        return True, frame
+
+    def release(self):
+        self.background = None
+
+
+def create_frame_source(spec=None, realtime=True, loop=False):
+    """Builds a frame source from a CLI-style spec: camera index, "synthetic", a directory or a video file."""
+    if spec is None or str(spec).isdigit():
+        return CameraSource(int(spec or 0))
+    if spec == "synthetic":
+        return SyntheticSource(realtime=realtime)
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
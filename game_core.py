@@ -0,0 +1,57 @@
+CHOICES = ("Rock", "Paper", "Scissors")  # Same order as gestures.GESTURES
+TIE, PLAYER, OPPONENT = "tie", "player", "computer"
+
+BEATS = {"Rock": "Scissors", "Paper": "Rock", "Scissors": "Paper"}
+# (player choice, opponent choice) -> round winner
+OUTCOMES = {(player, opponent): TIE if player == opponent else PLAYER if BEATS[player] == opponent else OPPONENT
+            for player in CHOICES for opponent in CHOICES}
+
+
+class GameState:
+    """Rules, scores and round flow of one match; no Qt involved.
+
+    With best_of set, the match ends as soon as the leader can no longer be
+    caught; otherwise all max_rounds rounds are played.
+    """
+
+    def __init__(self, max_rounds=5, best_of=False):
+        self.max_rounds = max_rounds
+        self.best_of = best_of
+        self.reset()
+
+    def reset(self):
+        self.rounds = []  # (player choice, opponent choice, winner) per round played
+        self.player_score = 0
+        self.opponent_score = 0
+
+    @property
+    def rounds_played(self):
+        return len(self.rounds)
+
+    @property
+    def round_number(self):
+        # 1-based number of the round being played, or of the last one once the match is over
+        return min(self.rounds_played + 1, self.max_rounds)
+
+    def play_round(self, player_choice, opponent_choice):
+        winner = OUTCOMES[(player_choice, opponent_choice)]
+        if winner == PLAYER:
+            self.player_score += 1
+        elif winner == OPPONENT:
+            self.opponent_score += 1
+        self.rounds.append((player_choice, opponent_choice, winner))
+        return winner
+
+    @property
+    def finished(self):
+        remaining = self.max_rounds - self.rounds_played
+        if remaining <= 0:
+            return True
+        return self.best_of and abs(self.player_score - self.opponent_score) > remaining
+
+    def match_winner(self):
+        if self.player_score > self.opponent_score:
+            return PLAYER
+        if self.opponent_score > self.player_score:
+            return OPPONENT
+        return TIE
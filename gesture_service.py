@@ -0,0 +1,319 @@
+import argparse
+import base64
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from gestures import classify_gestures, landmarks_to_array
+
+
+def encode_frame(rgb_frame, quality=85):
+    """JPEG-encodes a frame for the wire. Channels are kept in the order given (RGB here)."""
+    ok, data = cv2.imencode(".jpg", rgb_frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("Could not encode frame")
+    return base64.b64encode(data.tobytes()).decode("ascii")
+
+
+def decode_frame(encoded):
+    frame = cv2.imdecode(np.frombuffer(base64.b64decode(encoded), dtype=np.uint8), cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError("Could not decode frame")
+    return frame
+
+
+def parse_hands(result):
+    """Turns one frame's JSON result back into (points, handedness label, score) tuples."""
+    return [(np.asarray(hand["landmarks"], dtype=np.float32), hand["handedness"], float(hand["score"]))
+            for hand in result]
+
+
+class GestureRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so pooled clients reuse their connections
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            if self.path == "/v1/frames":
+                response = self.server.service.detect(request)
+            elif self.path == "/v1/landmarks":
+                response = self.server.service.classify(request)
+            else:
+                self.send_json(404, {"error": f"Unknown endpoint {self.path}"})
+                return
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        self.send_json(200, response)
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # One line per frame would flood the console
+
+
+class SessionModel:
+    """One client session's hand model. Built on first use; `lock` is held while it processes frames."""
+
+    def __init__(self):
+        self.lock = threading.Lock()  # MediaPipe graphs are not thread-safe
+        self.hands = None
+        self.last_used = time.monotonic()
+        self.closed = False
+
+    def close(self):
+        with self.lock:  # Waits for a request still using it
+            self.closed = True
+            if self.hands is not None:
+                self.hands.close()
+                self.hands = None
+
+
+class GestureService:
+    """HTTP service running hand inference and gesture classification for thin clients.
+
+    POST /v1/frames    {"frame" | "frames": JPEG base64, "max_hands": n, "session": id}
+                       -> {"results": [[{"landmarks", "handedness", "score", "gesture"}, ...], ...]}
+    POST /v1/landmarks {"landmarks": (21, 3) or (N, 21, 3) list} -> {"gestures": [...]}
+
+    Requests with a session id get their own tracking model, so a client's
+    frames are tracked from one to the next; anonymous frames are treated as
+    unrelated still images. Models idle for `idle_timeout` seconds, and the
+    least recently used ones beyond `max_models`, are closed, so clients
+    that come and go don't pile up graphs.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, max_num_hands=2, idle_timeout=300.0, max_models=16):
+        self.max_num_hands = max_num_hands
+        self.idle_timeout = idle_timeout
+        self.max_models = max_models
+        self._models = OrderedDict()  # (session, max hands) -> SessionModel, least recently used first
+        self._models_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), GestureRequestHandler)
+        self.server.daemon_threads = True
+        self.server.service = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def model(self, session, max_hands):
+        """Returns the session's model with its lock held; the caller releases `lock` when done."""
+        key = (session, max_hands)
+        while True:
+            with self._models_lock:
+                entry = self._models.get(key)
+                if entry is None:
+                    entry = self._models[key] = SessionModel()
+                self._models.move_to_end(key)
+                entry.last_used = time.monotonic()
+                evicted = self._expired_models()
+            for old in evicted:
+                old.close()
+            entry.lock.acquire()
+            if not entry.closed:
+                break
+            entry.lock.release()  # Evicted between lookup and lock: look it up again
+        if entry.hands is None:
+            # Built under the session's own lock only, so other sessions keep being served meanwhile
+            try:
+                import mediapipe as mp
+                entry.hands = mp.solutions.hands.Hands(static_image_mode=session is None, max_num_hands=max_hands,
+                                                       min_detection_confidence=0.7, min_tracking_confidence=0.7)
+            except BaseException:
+                entry.lock.release()
+                raise
+        return entry
+
+    def _expired_models(self):
+        # Called with _models_lock held; the models are closed after it is released
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = [key for key, entry in self._models.items() if entry.last_used < cutoff]
+        kept = [key for key in self._models if key not in expired]
+        expired += kept[:max(0, len(kept) - self.max_models)]  # Least recently used first
+        return [self._models.pop(key) for key in expired]
+
+    def detect(self, request):
+        frames = request["frames"] if "frames" in request else [request["frame"]]
+        max_hands = max(1, min(int(request.get("max_hands", 1)), self.max_num_hands))
+        entry = self.model(request.get("session"), max_hands)
+
+        results = []
+        try:
+            for encoded in frames:
+                results_for_frame = entry.hands.process(decode_frame(encoded))
+                hands = []
+                for index, hand_landmarks in enumerate(results_for_frame.multi_hand_landmarks or ()):
+                    handedness = results_for_frame.multi_handedness[index].classification[0]
+                    hands.append((landmarks_to_array(hand_landmarks), handedness.label, handedness.score))
+                results.append(hands)
+        finally:
+            entry.lock.release()
+
+        # Every hand of the batch is classified in one vectorized call
+        points = [hand[0] for hands in results for hand in hands]
+        gestures = iter(classify_gestures(np.stack(points)) if points else ())
+        return {"results": [[{"landmarks": hand[0].tolist(), "handedness": hand[1], "score": hand[2],
+                              "gesture": next(gestures)} for hand in hands] for hands in results]}
+
+    def classify(self, request):
+        landmarks = np.asarray(request["landmarks"], dtype=np.float32)
+        if landmarks.ndim == 2:
+            landmarks = landmarks[None]
+        if landmarks.ndim != 3 or landmarks.shape[1:] != (21, 3):
+            raise ValueError(f"Expected (21, 3) or (N, 21, 3) landmarks, got {landmarks.shape}")
+        return {"gestures": list(classify_gestures(landmarks))}
+
+    def start(self):
+        """Serves on a background thread, e.g. for a client talking to it over loopback."""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="gesture-service", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+        with self._models_lock:
+            models = list(self._models.values())
+            self._models.clear()
+        for entry in models:
+            entry.close()
+
+
+class RemoteInferenceClient:
+    """Sends frames to a GestureService over pooled keep-alive connections.
+
+    submit() pipelines up to `max_in_flight` requests; completed() hands the
+    results back in frame order. A request that fails or times out is
+    answered by the `fallback` (local inference) instead, and the service is
+    left alone for `retry_interval` seconds after a failure.
+    """
+
+    needs_local_model = True  # For the fallback
+
+    def __init__(self, url, timeout=0.25, max_in_flight=2, max_hands=1, session_id=None,
+                 retry_interval=2.0, jpeg_quality=85):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.max_hands = max_hands
+        self.session_id = session_id or uuid.uuid4().hex
+        self.retry_interval = retry_interval
+        self.jpeg_quality = jpeg_quality
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="gesture-client")
+        self.pending = deque()  # (future or None, rgb frame, context) in submission order
+        self.remote_failures = 0
+        self.local_fallbacks = 0
+        self._retry_at = 0.0
+
+    def load(self):
+        pass  # Connections are opened by the first request
+
+    def post(self, path, payload):
+        response = self.session.post(self.url + path, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def detect_hands(self, rgb_frames):
+        """Blocking batch call: one list of (points, handedness label, score) per frame."""
+        payload = {"frames": [encode_frame(frame, self.jpeg_quality) for frame in rgb_frames],
+                   "max_hands": self.max_hands, "session": self.session_id}
+        return [parse_hands(result) for result in self.post("/v1/frames", payload)["results"]]
+
+    def classify(self, landmarks):
+        """Blocking batch call: gesture labels for an (N, 21, 3) array of landmarks."""
+        landmarks = np.asarray(landmarks, dtype=np.float32)
+        return self.post("/v1/landmarks", {"landmarks": landmarks.tolist()})["gestures"]
+
+    def submit(self, rgb_frame, context=None):
+        future = None
+        if time.monotonic() >= self._retry_at:
+            future = self.executor.submit(self.detect_hands, [rgb_frame])
+        self.pending.append((future, rgb_frame, context))
+
+    def completed(self, fallback):
+        """Returns (rgb frame, context, hands) for finished requests, oldest first.
+
+        Only blocks, on the oldest request, once more than `max_in_flight` are outstanding.
+        """
+        done = []
+        while self.pending:
+            future, rgb_frame, context = self.pending[0]
+            if future is not None and not future.done() and len(self.pending) <= self.max_in_flight:
+                break
+            self.pending.popleft()
+            hands = None
+            if future is not None:
+                try:
+                    hands = future.result()[0]
+                except (requests.RequestException, ValueError, KeyError):
+                    self.remote_failures += 1
+                    self._retry_at = time.monotonic() + self.retry_interval
+            if hands is None:
+                self.local_fallbacks += 1
+                hands = fallback(rgb_frame)
+            done.append((rgb_frame, context, hands))
+        return done
+
+    def discard(self):
+        # Results still in flight belong to frames nobody wants any more
+        self.pending.clear()
+
+    def close(self):
+        self.discard()
+        self.executor.shutdown(wait=False)
+        self.session.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gesture recognition service for thin game clients")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--max-hands", type=int, default=2, help="most hands a client may ask for")
+    parser.add_argument("--idle-timeout", type=float, default=300.0,
+                        help="seconds after which an unused client model is closed")
+    parser.add_argument("--max-models", type=int, default=16, help="most client models kept open at once")
+    args = parser.parse_args(argv)
+
+    service = GestureService(args.host, args.port, max_num_hands=args.max_hands,
+                             idle_timeout=args.idle_timeout, max_models=args.max_models)
+    print(f"Gesture service listening on {service.url}", flush=True)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
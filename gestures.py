@@ -0,0 +1,72 @@
+import numpy as np
+
+
+GESTURES = ("Rock", "Paper", "Scissors")
+NO_GESTURE = -1
+
+# MediaPipe hand landmark indices
+WRIST = 0
+THUMB_MCP, THUMB_TIP = 2, 4
+INDEX_FINGER_MCP, INDEX_FINGER_TIP = 5, 8
+MIDDLE_FINGER_MCP, MIDDLE_FINGER_TIP = 9, 12
+RING_FINGER_MCP, RING_FINGER_TIP = 13, 16
+PINKY_MCP, PINKY_TIP = 17, 20
+
+FINGER_TIPS = [INDEX_FINGER_TIP, MIDDLE_FINGER_TIP, RING_FINGER_TIP, PINKY_TIP]
+FINGER_MCPS = [INDEX_FINGER_MCP, MIDDLE_FINGER_MCP, RING_FINGER_MCP, PINKY_MCP]
+
+# Code -> label lookup; NO_GESTURE (-1) picks the trailing None
+_LABELS = np.array(GESTURES + (None,), dtype=object)
+
+
+def landmarks_to_array(hand_landmarks):
+    """Converts MediaPipe hand landmarks into a (21, 3) float32 array of x, y, z."""
+    return np.array([(landmark.x, landmark.y, landmark.z) for landmark in hand_landmarks.landmark],
+                    dtype=np.float32)
+
+
+def classify_gesture_codes(landmarks):
+    """Classifies an (N, 21, 3) batch of landmarks into N gesture codes (index into GESTURES or NO_GESTURE)."""
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    x = landmarks[:, :, 0]
+    y = landmarks[:, :, 1]
+    wrist_y = y[:, WRIST]
+    thumb_tip_y = y[:, THUMB_TIP]
+
+    # Check finger extension based on y-coordinate relative to MCP and wrist
+    tips_y = y[:, FINGER_TIPS]
+    mcps_y = y[:, FINGER_MCPS]
+    extended = (tips_y < mcps_y) & (tips_y < wrist_y[:, None])
+    index_extended, middle_extended, ring_extended, pinky_extended = extended.T
+
+    # Thumb extension is more complex due to its movement range
+    thumb_extended = (x[:, THUMB_TIP] > x[:, THUMB_MCP]) | (x[:, THUMB_TIP] < x[:, WRIST])
+
+    # Distances are computed in float64 to match the per-landmark Python implementation exactly
+    dx = x[:, INDEX_FINGER_TIP].astype(np.float64) - x[:, MIDDLE_FINGER_TIP]
+    dy = y[:, INDEX_FINGER_TIP].astype(np.float64) - y[:, MIDDLE_FINGER_TIP]
+    index_middle_dist = np.sqrt(dx * dx + dy * dy)
+
+    # Rock: All fingers curled
+    rock = (thumb_tip_y > y[:, THUMB_MCP]) & (tips_y > mcps_y).all(axis=1)
+    # Paper: All fingers extended and thumb extended and up.
+    paper = extended.all(axis=1) & thumb_extended & (thumb_tip_y < wrist_y)
+    # Scissors: Index and middle fingers extended, others curled, and sufficient distance between them.
+    scissors = index_extended & middle_extended & ~ring_extended & ~pinky_extended & (index_middle_dist > 0.08)
+
+    # Assign in reverse priority so Rock wins over Paper wins over Scissors
+    codes = np.full(len(landmarks), NO_GESTURE, dtype=np.int8)
+    codes[scissors] = 2
+    codes[paper] = 1
+    codes[rock] = 0
+    return codes
+
+
+def classify_gestures(landmarks):
+    """Classifies an (N, 21, 3) batch of landmarks into an array of N labels ("Rock", ... or None)."""
+    return _LABELS[classify_gesture_codes(landmarks)]
+
+
+def classify_gesture(landmarks):
+    """Classifies a single (21, 3) landmark array; returns a label or None."""
+    return _LABELS[classify_gesture_codes(landmarks[None])[0]]
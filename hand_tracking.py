@@ -0,0 +1,353 @@
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from capture import CaptureThread, LatestFrameBuffer
+from display import FrameBufferPool, fit_size
+from frame_sources import CameraSource
+from gestures import WRIST, classify_gesture, landmarks_to_array
+from metrics import PipelineMetrics
+from roi import HandRoiTracker
+from scheduler import InferenceScheduler
+from smoothing import GestureSmoother
+from tracing import tracer
+
+
+class HandTrackingThread(QThread):
+    image_data = pyqtSignal()  # A new frame is waiting in display_mailbox
+    # Gesture, wrist x, y, then the ID and capture time of the frame that settled the gesture
+    gesture_detected = pyqtSignal(str, float, float, int, float)  # Player 1 only, kept for single-player games
+    player_gesture_detected = pyqtSignal(int, str, float, float, int, float)  # Player index first
+    error_signal = pyqtSignal(str)
+    ready = pyqtSignal()  # Model loaded and frame source open
+    metrics_updated = pyqtSignal(dict)  # A PipelineMetrics snapshot every metrics_interval seconds
+
+    def __init__(self, frame_source=None, roi_tracking=False, players=1, player_assignment="side",
+                 inference_client=None, recorder=None):
+        super().__init__()
+        self.frame_source = frame_source or CameraSource(0)
+        self.cap = None
+        self.capture_thread = None
+        self.frame_buffer = LatestFrameBuffer()
+        self.scheduler = InferenceScheduler()
+        self.display_size = (480, 360)
+        self.display_pool = None
+        self.display_dropped = 0
+        # The GUI takes the newest frame from here; frames it never got to go back to the pool
+        self.display_mailbox = LatestFrameBuffer(on_drop=lambda display_frame: display_frame.release())
+        self._reset_requested = False
+        self._run_flag = True
+        self.mp_hands = mp.solutions.hands
+        self.hands = None  # Loaded on the tracking thread, see load_model()
+        # Optional RemoteInferenceClient (the local model then only answers requests that time out),
+        # LiveStreamHandLandmarker (MediaPipe Tasks, asynchronous) or LandmarkReplay (recorded landmarks)
+        self.inference_client = inference_client
+        self.recorder = recorder  # Optional SessionRecorder; it never blocks this thread
+        self.init_timings = {}  # Seconds spent on model load and camera open
+        # Run inference on a crop around the last known hand instead of the full frame.
+        # With two players a crop around one hand would lose the other, so it is single-player only.
+        # Only the local model crops: with an inference client it covers the client's fallbacks at most.
+        local_model = inference_client is None or inference_client.needs_local_model
+        self.roi_tracker = HandRoiTracker() if roi_tracking and players == 1 and local_model else None
+        self.players = players
+        self.player_assignment = player_assignment  # "side" of the screen or "handedness"
+        self.smoothers = [GestureSmoother() for _ in range(players)]
+        self.metrics = PipelineMetrics()
+        self.metrics_interval = 1.0
+
+    def run(self):
+        try:
+            self.load_model()
+
+            started = time.perf_counter()
+            self.cap = self.frame_source
+            if not self.cap.open():
+                self.error_signal.emit("Could not open camera!")
+                return
+            self.init_timings["camera_open"] = time.perf_counter() - started
+
+            # Capture runs on its own thread so inference always gets the newest frame
+            self.capture_thread = CaptureThread(self.cap, self.frame_buffer, self.scheduler)
+            self.capture_thread.start()
+            self.ready.emit()
+            full_generation = self.scheduler.full_generation
+            last_preview_time = 0.0
+            last_metrics_time = time.perf_counter()
+            clock = time.perf_counter
+
+            while self._run_flag:
+                mode = self.scheduler.wait_while_paused(timeout=0.5)
+                if clock() - last_metrics_time >= self.metrics_interval:
+                    last_metrics_time = clock()
+                    self.metrics_updated.emit(self.metrics_snapshot(mode))
+                if self._reset_requested:
+                    self._reset_requested = False
+                    for smoother in self.smoothers:
+                        smoother.reset()
+                    if self.roi_tracker:
+                        self.roi_tracker.reset()
+                    self.frame_buffer.clear()
+                    self.display_mailbox.clear()
+                    if self.inference_client:
+                        self.inference_client.discard()
+                if mode == InferenceScheduler.PAUSED:
+                    continue
+                if mode == InferenceScheduler.PREVIEW:
+                    # Preview only needs a few frames per second
+                    delay = last_preview_time + self.scheduler.preview_interval - time.perf_counter()
+                    if delay > 0:
+                        # Wakes at once when the round opens (FULL), not at the next preview tick
+                        self.scheduler.wait_for_change(mode, delay)
+                        continue
+
+                t0 = clock()
+                item = self.frame_buffer.get(timeout=0.5)
+                if item is None:
+                    if self.frame_buffer.closed:
+                        if self.capture_thread.error:
+                            self.error_signal.emit(self.capture_thread.error)
+                        break
+                    continue
+                frame, captured_at, frame_id = item
+                t1 = clock()
+                self.metrics.record("wait", t1 - t0)  # Long waits: the camera is the bottleneck
+                self.metrics.record("frame_age", t1 - captured_at)  # Long ages: processing is
+                frame = cv2.flip(frame, 1)
+                if self.recorder:
+                    self.recorder.record_frame(frame, captured_at, frame_id)  # Nothing modifies `frame` later
+                t2 = clock()
+                self.metrics.record("flip", t2 - t1)
+
+                if mode == InferenceScheduler.PREVIEW:
+                    last_preview_time = t2
+                    self.emit_image(frame, is_bgr=True, frame_id=frame_id, captured_at=captured_at)
+                    self.metrics.record("display", clock() - t2)
+                    tracer.complete("preview", t1, frame_id=frame_id, flow="t")
+                    continue
+
+                if self.scheduler.full_generation != full_generation:
+                    # A new round started: forget gestures seen before it
+                    full_generation = self.scheduler.full_generation
+                    for smoother in self.smoothers:
+                        smoother.reset()
+                    if self.roi_tracker:
+                        self.roi_tracker.reset()
+                    if self.inference_client:
+                        self.inference_client.discard()
+
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                t3 = clock()
+                self.metrics.record("cvtColor", t3 - t2)
+                if self.inference_client:
+                    # Frames are pipelined to the service; results come back in frame order
+                    self.inference_client.submit(rgb_frame, (captured_at, frame_id))
+                    completed = self.inference_client.completed(self.find_hands)
+                else:
+                    completed = [(rgb_frame, (captured_at, frame_id), self.find_hands(rgb_frame))]
+                t4 = clock()
+                self.metrics.record("inference", t4 - t3)
+                tracer.complete("inference", t3, t4, frame_id)
+
+                for rgb_frame, (captured_at, frame_id), hands in completed:
+                    self.metrics.count("inferred")
+                    if self.recorder:
+                        self.recorder.record_landmarks([points for points, _, _ in hands], captured_at, frame_id)
+                    t5 = clock()
+                    self.update_players(hands, captured_at, frame_id)
+                    t6 = clock()
+                    self.emit_image(rgb_frame, [points for points, _, _ in hands], frame_id=frame_id,
+                                    captured_at=captured_at)
+                    self.metrics.record("gesture", t6 - t5)
+                    self.metrics.record("display", clock() - t6)
+                    tracer.complete("process", t1, frame_id=frame_id, flow="t")
+        except Exception as e:
+            error_message = f"Error in hand tracking thread: {str(e)}"  # More descriptive error
+            self.error_signal.emit(error_message)
+        finally:
+            self.stop_capture()
+            if self.inference_client:
+                self.inference_client.close()
+
+    def load_model(self):
+        started = time.perf_counter()
+        if self.inference_client:
+            self.inference_client.load()
+        if self.hands is None and (self.inference_client is None or self.inference_client.needs_local_model):
+            self.hands = self.mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=self.players,
+                min_detection_confidence=0.7,
+                min_tracking_confidence=0.7
+            )
+        self.init_timings["model_load"] = time.perf_counter() - started
+
+    def find_hands(self, rgb_frame):
+        """Runs the local model; returns (points, handedness label, score) for every hand found."""
+        results = self.run_inference(rgb_frame)
+        hands = []
+        for index, hand_landmarks in enumerate(results.multi_hand_landmarks or ()):
+            # Read the landmarks out of the protobuf objects once per frame
+            handedness = results.multi_handedness[index].classification[0]
+            hands.append((landmarks_to_array(hand_landmarks), handedness.label, handedness.score))
+        return hands
+
+    def update_players(self, hands, captured_at, frame_id=-1):
+        # One inference pass serves every player; each keeps its own smoothing state
+        assigned = self.assign_players(hands)
+        for player, smoother in enumerate(self.smoothers):
+            hand = assigned.get(player)
+            if hand is None:
+                # No hand in view counts as a vote for "no gesture"
+                smoother.update(None, 1.0, captured_at)
+                continue
+            points, _, confidence = hand
+            gesture = self.detect_gesture(points)
+
+            # Use wrist position for x, y coordinates (more stable)
+            x = float(points[WRIST, 0])
+            y = float(points[WRIST, 1])
+
+            # Only emits when the smoothed gesture changes to a new one
+            stable_gesture = smoother.update(gesture, confidence, captured_at)
+            if stable_gesture:
+                # The GUI continues this frame's "result" flow up to the choice being shown
+                tracer.complete("gesture " + stable_gesture, time.perf_counter(), frame_id=frame_id, flow="s",
+                                flow_name="result", player=player)
+                if self.recorder:
+                    # Players are assigned by side or handedness, so the hand's own index labels the landmarks
+                    hand_index = next(index for index, candidate in enumerate(hands) if candidate is hand)
+                    self.recorder.record_gesture(player, stable_gesture, captured_at, frame_id, hand=hand_index)
+                self.player_gesture_detected.emit(player, stable_gesture, x, y, frame_id, captured_at)
+                if player == 0:
+                    self.gesture_detected.emit(stable_gesture, x, y, frame_id, captured_at)
+
+    def assign_players(self, hands):
+        """Maps player index -> (points, handedness label, score) for the hands found in a frame."""
+        if not hands:
+            return {}
+        if self.players == 1:
+            return {0: hands[0]}
+
+        labels = [label for _, label, _ in hands[:2]]
+        if self.player_assignment == "handedness" and len(set(labels)) == len(labels):
+            # Player 1 shows the right hand, player 2 the left one
+            return {0 if label == "Right" else 1: hand for label, hand in zip(labels, hands)}
+
+        # Player 1 stands on the left half of the (mirrored) preview, player 2 on the right
+        if len(hands) == 1:
+            return {0 if hands[0][0][WRIST, 0] < 0.5 else 1: hands[0]}
+        left, right = sorted(hands[:2], key=lambda hand: hand[0][WRIST, 0])
+        return {0: left, 1: right}
+
+    def set_display_size(self, width, height):
+        # Frames are scaled to this size on the tracking thread, not by the GUI
+        self.display_size = (width, height)
+
+    def render_display_frame(self, frame, is_bgr=False):
+        """Scales a frame into a pooled display buffer; returns None if every buffer is still in use."""
+        height, width = frame.shape[:2]
+        size = fit_size(width, height, *self.display_size)
+        if self.display_pool is None or (self.display_pool.width, self.display_pool.height) != size:
+            self.display_pool = FrameBufferPool(*size)
+
+        display_frame = self.display_pool.acquire()
+        if display_frame is None:
+            self.display_dropped += 1
+            return None
+        cv2.resize(frame, size, dst=display_frame.array, interpolation=cv2.INTER_AREA)
+        if is_bgr:
+            cv2.cvtColor(display_frame.array, cv2.COLOR_BGR2RGB, dst=display_frame.array)
+        return display_frame
+
+    def emit_image(self, frame, hand_points=(), is_bgr=False, frame_id=-1, captured_at=0.0):
+        display_frame = self.render_display_frame(frame, is_bgr)
+        if display_frame is None:
+            return
+        display_frame.frame_id = frame_id
+        display_frame.captured_at = captured_at
+        # Only the arrays travel with the frame; VideoWidget paints them over it
+        display_frame.hands = hand_points
+        self.metrics.count("displayed")
+        # Only notify the GUI when the mailbox was empty, so queued signals never pile up
+        if not self.display_mailbox.put(display_frame):
+            self.image_data.emit()
+
+    def metrics_snapshot(self, mode):
+        if self.capture_thread:
+            self.metrics.set_counter("captured", self.capture_thread.frames_captured)
+        return self.metrics.snapshot(
+            mode=mode,
+            queue_depth=self.frame_buffer.pending + (len(self.inference_client.pending) if self.inference_client else 0),
+            dropped_frames=self.dropped_frames,
+            preview_skipped=self.capture_thread.dropped_by_mode.get(InferenceScheduler.PREVIEW, 0)
+            if self.capture_thread else 0,
+            display_dropped=self.display_dropped,
+            display_coalesced=self.display_coalesced,
+            local_fallbacks=self.inference_client.local_fallbacks if self.inference_client else 0,
+            recorder_dropped=dict(self.recorder.dropped) if self.recorder else None,
+        )
+
+    @property
+    def display_coalesced(self):
+        # Frames replaced in the mailbox before the GUI took them
+        return self.display_mailbox.dropped
+
+    def run_inference(self, rgb_frame):
+        if self.roi_tracker is None:
+            return self.hands.process(rgb_frame)
+
+        image, box = self.roi_tracker.crop(rgb_frame)
+        results = self.hands.process(image)
+        if not results.multi_hand_landmarks and box is not None:
+            # Tracking lost: search the full frame again
+            self.roi_tracker.misses += 1
+            self.roi_tracker.reset()
+            box = None
+            results = self.hands.process(rgb_frame)
+
+        if results.multi_hand_landmarks:
+            for hand_landmarks in results.multi_hand_landmarks:
+                self.roi_tracker.remap(hand_landmarks, box, rgb_frame.shape)
+            self.roi_tracker.update(results.multi_hand_landmarks[0], rgb_frame.shape)
+        return results
+
+    def stop_capture(self):
+        if self.capture_thread:
+            self.capture_thread.stop()
+            self.capture_thread.join()
+            self.capture_thread = None
+        if self.cap:
+            self.cap.release()
+
+    @property
+    def dropped_frames(self):
+        # Frames the capture thread replaced before inference got to them. Only FULL counts:
+        # PREVIEW skips frames on purpose, see preview_skipped in metrics_snapshot
+        if self.capture_thread is None:
+            return 0
+        return self.capture_thread.dropped_by_mode.get(InferenceScheduler.FULL, 0)
+
+    def detect_gesture(self, landmarks):
+        """Classifies a (21, 3) landmark array (or raw MediaPipe landmarks) as Rock, Paper, Scissors or None."""
+        if not isinstance(landmarks, np.ndarray):
+            landmarks = landmarks_to_array(landmarks)
+        return classify_gesture(landmarks)
+
+    def pause(self):
+        # Stops capture and inference but keeps the model loaded and the camera open
+        self.scheduler.set_mode(InferenceScheduler.PAUSED)
+
+    def resume(self, mode=InferenceScheduler.PREVIEW):
+        self.scheduler.set_mode(mode)
+
+    def reset(self):
+        # Per-game state is dropped on the tracking thread before it handles its next frame
+        self._reset_requested = True
+
+    def stop(self):
+        self._run_flag = False
+        self.frame_buffer.close()
+        self.wait()
@@ -0,0 +1,318 @@
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from frame_sources import FrameSource
+from gestures import GESTURES, NO_GESTURE, classify_gesture_codes
+
+
+MAGIC = b"RPSLMK1\0"
+HEADER_SIZE = 64  # Magic, record count, padding; records start at this offset
+
+# One hand in one frame. Frames without a hand get a single record with hand == -1.
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),  # Capture time, perf_counter seconds of the recording host
+    ("frame_id", "<i8"),
+    ("session", "<u4"),
+    ("round", "<i4"),  # Counts up within a session; -1 before the first round
+    ("hand", "<i1"),  # Index of the hand in the frame, -1 for no hand
+    ("gesture", "<i1"),  # Label: index into GESTURES or NO_GESTURE
+    ("landmarks", "<f4", (21, 3)),
+], align=True)
+
+# One run of consecutive records of the same session and round
+INDEX_DTYPE = np.dtype([
+    ("session", "<u4"),
+    ("round", "<i4"),
+    ("start", "<i8"),
+    ("stop", "<i8"),
+    ("start_time", "<f8"),
+    ("end_time", "<f8"),
+])
+
+
+def index_path(path):
+    return path + ".idx.npy"
+
+
+class LandmarkDatasetWriter:
+    """Appends sessions of landmark records to a dataset file and writes the sidecar index on close."""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.index = []
+        self._file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        self._file.seek(0)
+        self._file.write(MAGIC + struct.pack("<Q", self.count).ljust(HEADER_SIZE - len(MAGIC), b"\0"))
+        self._file.seek(0, os.SEEK_END)
+
+    def append_session(self, session, records):
+        """Writes one session's records (a RECORD_DTYPE array) sorted by timestamp."""
+        records = np.array(records, dtype=RECORD_DTYPE)
+        if not len(records):
+            return
+        records["session"] = session
+        records = records[np.argsort(records["timestamp"], kind="stable")]
+
+        rounds = records["round"]
+        starts = np.r_[0, np.flatnonzero(rounds[1:] != rounds[:-1]) + 1]
+        stops = np.r_[starts[1:], len(records)]
+        timestamps = records["timestamp"]
+        for start, stop in zip(starts, stops):
+            self.index.append((session, rounds[start], self.count + start, self.count + stop,
+                               timestamps[start], timestamps[stop - 1]))
+
+        self._file.write(records.tobytes())
+        self.count += len(records)
+
+    def close(self):
+        self._write_header()
+        self._file.close()
+        np.save(index_path(self.path), np.array(self.index, dtype=INDEX_DTYPE))
+
+
+def records_from_recording(path):
+    """Builds dataset records from a SessionRecorder file: one per recorded hand, labelled with settled gestures."""
+    from recorder import EVENT, GESTURE, LANDMARKS, read_recording
+
+    chunks = []
+    last = None  # Records of the latest landmarks chunk, labelled in place by the gestures that follow it
+    round_id = -1
+    for kind, timestamp, frame_id, data in read_recording(path, decode_frames=False):
+        if kind == EVENT and data["name"] == "round_start":
+            round_id += 1
+        elif kind == LANDMARKS:
+            last = np.zeros(max(len(data), 1), dtype=RECORD_DTYPE)
+            last["timestamp"] = timestamp
+            last["frame_id"] = frame_id
+            last["round"] = round_id
+            last["gesture"] = NO_GESTURE
+            if len(data):
+                last["hand"] = np.arange(len(data))
+                last["landmarks"] = data
+            else:
+                last["hand"] = -1
+            chunks.append(last)
+        elif kind == GESTURE and last is not None and last["frame_id"][0] == frame_id:
+            hand = data.get("hand")
+            if hand is None and len(last) == 1:
+                hand = 0  # Older recordings: unambiguous only with one hand in the frame
+            if hand is not None and hand < len(last):
+                last["gesture"][hand] = GESTURES.index(data["gesture"])
+    return np.concatenate(chunks) if chunks else np.zeros(0, dtype=RECORD_DTYPE)
+
+
+class LandmarkDataset:
+    """A dataset file opened with numpy.memmap: every selection is a zero-copy view of the file."""
+
+    def __init__(self, path, mode="r"):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a landmark dataset")
+        count, = struct.unpack_from("<Q", header, len(MAGIC))
+        self.records = np.memmap(path, dtype=RECORD_DTYPE, mode=mode, offset=HEADER_SIZE, shape=(count,))
+        self.index = np.load(index_path(path))
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def sessions(self):
+        return np.unique(self.index["session"])
+
+    def rounds(self, session):
+        entries = self.index[self.index["session"] == session]
+        return np.unique(entries["round"][entries["round"] >= 0])
+
+    def _span(self, entries):
+        if not len(entries):
+            return self.records[:0]
+        return self.records[entries["start"].min():entries["stop"].max()]
+
+    def session(self, session):
+        return self._span(self.index[self.index["session"] == session])
+
+    def round(self, session, round_id):
+        return self._span(self.index[(self.index["session"] == session) & (self.index["round"] == round_id)])
+
+    def time_range(self, session, start_time, end_time):
+        """Records of a session captured in [start_time, end_time)."""
+        records = self.session(session)
+        timestamps = records["timestamp"]
+        return records[np.searchsorted(timestamps, start_time):np.searchsorted(timestamps, end_time)]
+
+
+def score_gestures(records, chunk_size=1 << 16):
+    """Runs the gesture classifier over records in chunks; compares it with the labels where there are any.
+
+    Returns the counts of classified gestures and a confusion matrix of
+    label (rows) against classifier output (columns), both indexed by
+    GESTURES followed by "None".
+    """
+    counts = np.zeros(len(GESTURES) + 1, dtype=np.int64)
+    confusion = np.zeros((len(GESTURES) + 1, len(GESTURES) + 1), dtype=np.int64)
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start:start + chunk_size]
+        chunk = chunk[chunk["hand"] >= 0]
+        codes = classify_gesture_codes(chunk["landmarks"]).astype(np.intp)
+        codes[codes < 0] = len(GESTURES)  # NO_GESTURE goes in the last column
+        counts += np.bincount(codes, minlength=len(counts))
+        labelled = chunk["gesture"] >= 0
+        labels = chunk["gesture"][labelled].astype(np.intp)
+        np.add.at(confusion, (labels, codes[labelled]), 1)
+    labelled_total = confusion.sum()
+    return {
+        "hands": int(counts.sum()),
+        "classified": dict(zip(GESTURES + ("None",), counts.tolist())),
+        "labelled": int(labelled_total),
+        "agreement": float(np.trace(confusion) / labelled_total) if labelled_total else None,
+        "confusion": confusion.tolist(),
+    }
+
+
+class ReplayFrameSource(FrameSource):
+    """Blank frames at the recorded frame times; the landmarks come from LandmarkReplay.
+
+    Each frame is due the recorded interval after the previous one, like
+    FrameSource._pace: after a stall (the tracking thread paused) or at the
+    start of another session, whose clock has a different origin, pacing
+    starts over from the current frame instead of bursting or sleeping.
+    """
+
+    def __init__(self, timestamps, width=640, height=480, realtime=True, sessions=None):
+        super().__init__(realtime=realtime)
+        self.timestamps = timestamps
+        self.sessions = sessions if sessions is not None else np.zeros(len(timestamps), dtype=np.uint32)
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.position = 0
+        self.opened = False
+
+    def open(self):
+        self.position = 0
+        self.end_of_stream = False
+        self.opened = True
+        self._next_frame_time = None
+        return True
+
+    def isOpened(self):
+        return self.opened
+
+    def read(self):
+        if self.position >= len(self.timestamps):
+            self.end_of_stream = True
+            return False, None
+        if self.realtime:
+            self._pace_record(self.position)
+        self.position += 1
+        return True, self.frame
+
+    def _pace_record(self, position):
+        now = time.perf_counter()
+        interval = 0.0
+        if position and self.sessions[position] == self.sessions[position - 1]:
+            interval = float(self.timestamps[position] - self.timestamps[position - 1])
+        if self._next_frame_time is None or interval <= 0.0:
+            self._next_frame_time = now  # First frame of a session
+            return
+        self._next_frame_time += interval
+        if now - self._next_frame_time > interval:
+            self._next_frame_time = now  # Fell behind: don't burst through the missed frames
+        elif self._next_frame_time > now:
+            time.sleep(self._next_frame_time - now)
+
+    def release(self):
+        self.opened = False
+
+
+class LandmarkReplay:
+    """Plays dataset records through HandTrackingThread in place of the camera and the hand model.
+
+    Pass frame_source() as the thread's frame source and the replay itself as
+    its inference_client. CaptureThread numbers frames from 1 in read order,
+    so frame ID n is answered with the hands of the n-th replayed frame, even
+    when the tracking thread skips frames.
+    """
+
+    needs_local_model = False
+
+    def __init__(self, records, realtime=True):
+        self.records = records
+        self.realtime = realtime
+        boundaries = np.flatnonzero((records["frame_id"][1:] != records["frame_id"][:-1]) |
+                                    (records["session"][1:] != records["session"][:-1])) + 1
+        self.frame_starts = np.r_[0, boundaries] if len(records) else np.zeros(0, dtype=np.intp)
+        self.frame_stops = np.r_[self.frame_starts[1:], len(records)] if len(records) else self.frame_starts
+        self.pending = deque()
+        self.local_fallbacks = 0
+
+    def load(self):
+        pass
+
+    def frame_source(self, width=640, height=480):
+        return ReplayFrameSource(self.records["timestamp"][self.frame_starts], width, height, self.realtime,
+                                 sessions=self.records["session"][self.frame_starts])
+
+    def hands(self, frame_index):
+        frame = self.records[self.frame_starts[frame_index]:self.frame_stops[frame_index]]
+        return [(np.array(record["landmarks"]), "Right", 1.0) for record in frame if record["hand"] >= 0]
+
+    def submit(self, rgb_frame, context):
+        self.pending.append((rgb_frame, context))
+
+    def completed(self, fallback):
+        done = [(rgb_frame, context, self.hands(context[1] - 1)) for rgb_frame, context in self.pending]
+        self.pending.clear()
+        return done
+
+    def discard(self):
+        self.pending.clear()
+
+    def close(self):
+        self.pending.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and analyze memory-mapped landmark datasets")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="convert session recordings into a dataset")
+    build.add_argument("output", help="dataset file to write")
+    build.add_argument("recordings", nargs="+", help="files written by --record")
+    score = commands.add_parser("score", help="run the gesture classifier over a dataset")
+    score.add_argument("dataset")
+    score.add_argument("--session", type=int, default=None)
+    score.add_argument("--round", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        writer = LandmarkDatasetWriter(args.output)
+        for session, recording in enumerate(args.recordings):
+            writer.append_session(session, records_from_recording(recording))
+        writer.close()
+        print(f"{writer.count} records from {len(args.recordings)} sessions written to {args.output}")
+        return 0
+
+    dataset = LandmarkDataset(args.dataset)
+    if args.session is None:
+        records = dataset.records
+    elif args.round is None:
+        records = dataset.session(args.session)
+    else:
+        records = dataset.round(args.session, args.round)
+    print(json.dumps(score_gestures(records), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import json
+import queue
+import sys
+import threading
+import time
+
+
+class PipelineMetrics:
+    """Counters and smoothed stage latencies updated by the tracking thread.
+
+    Updates are plain dict writes from a single thread, so they cost next to
+    nothing per frame; snapshot() turns them into rates once per interval.
+    """
+
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing  # Weight of the newest sample in the moving averages
+        self.latency_ms = {}
+        self.counters = {}
+        self._last_time = time.perf_counter()
+        self._last_counters = {}
+
+    def record(self, stage, seconds):
+        milliseconds = seconds * 1000
+        previous = self.latency_ms.get(stage)
+        self.latency_ms[stage] = milliseconds if previous is None else previous + self.smoothing * (milliseconds - previous)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_counter(self, name, value):
+        # For counts kept elsewhere, e.g. by the capture thread
+        self.counters[name] = value
+
+    def snapshot(self, **gauges):
+        """Rates per second since the previous snapshot, current latencies, totals and any extra gauges."""
+        now = time.perf_counter()
+        elapsed = max(now - self._last_time, 1e-9)
+        counters = dict(self.counters)
+        rates = {name: (value - self._last_counters.get(name, 0)) / elapsed for name, value in counters.items()}
+        self._last_time = now
+        self._last_counters = counters
+        return {
+            "time": time.time(),
+            "fps": {name: round(rate, 2) for name, rate in rates.items()},
+            "latency_ms": {stage: round(value, 2) for stage, value in self.latency_ms.items()},
+            "totals": counters,
+            **gauges,
+        }
+
+
+def format_metrics(snapshot):
+    """Short multi-line summary of a snapshot for the on-screen overlay."""
+    fps = snapshot["fps"]
+    lines = [
+        f"camera {fps.get('captured', 0.0):5.1f} fps   inference {fps.get('inferred', 0.0):5.1f} fps   "
+        f"display {fps.get('displayed', 0.0):5.1f} fps",
+        f"mode {snapshot.get('mode', '?')}   queue {snapshot.get('queue_depth', 0)}   "
+        f"dropped {snapshot.get('dropped_frames', 0)} (preview skipped {snapshot.get('preview_skipped', 0)})   "
+        f"display dropped {snapshot.get('display_dropped', 0)}",
+    ]
+    lines += [f"{stage:>10} {value:7.2f} ms" for stage, value in snapshot["latency_ms"].items()]
+    return "\n".join(lines)
+
+
+class MetricsLogger:
+    """Appends metric snapshots to a JSON lines file from a background thread."""
+
+    def __init__(self, path, max_pending=256):
+        self.path = path
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.dropped = 0
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="metrics-log", daemon=True)
+        self._thread.start()
+
+    def write(self, snapshot):
+        if self.error:
+            self.dropped += 1
+            return
+        try:
+            self.queue.put_nowait(snapshot)
+        except queue.Full:
+            self.dropped += 1  # A stuck disk must never stall the GUI
+
+    def _run(self):
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                while True:
+                    snapshot = self.queue.get()
+                    if snapshot is None:
+                        break
+                    f.write(json.dumps(snapshot) + "\n")
+                    f.flush()
+        except OSError as e:
+            self.error = f"Metrics log {self.path} stopped: {e}"
+
+    def close(self):
+        if self._thread.is_alive():
+            try:
+                self.queue.put(None, timeout=1.0)
+            except queue.Full:
+                pass  # A full queue means the log file stopped taking writes; the last snapshots are lost
+            self._thread.join(timeout=2)
+        if self.error:
+            print(self.error, file=sys.stderr)
@@ -0,0 +1,280 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from gestures import GESTURES
+
+
+# Moves are indices into GESTURES: Rock 0, Paper 1, Scissors 2. (m + 1) % 3 beats m.
+MOVES = len(GESTURES)
+# PAYOFF[(a - b) % 3] is a's result against b: tie, win, loss
+PAYOFF = np.array([0, 1, -1], dtype=np.int8)
+
+
+def counter_move(moves):
+    return (moves + 1) % MOVES
+
+
+class Strategy:
+    """An opponent playing `games` independent games at once (1 for the GUI).
+
+    moves() returns the next move of every game; it is computed ahead of time
+    by observe(), so asking for it costs nothing. observe() takes the moves of
+    one round and updates the strategy in constant time per game.
+    """
+
+    name = "strategy"
+
+    def __init__(self, games=1, rng=None):
+        self.games = games
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.rows = np.arange(games)
+        self.reset()
+
+    def reset(self):
+        self.next_moves = self.rng.integers(0, MOVES, self.games, dtype=np.int8)
+
+    def moves(self):
+        return self.next_moves
+
+    def observe(self, player_moves, own_moves):
+        self.next_moves = self.rng.integers(0, MOVES, self.games, dtype=np.int8)
+
+    # Single-game helpers for the GUI, which works with gesture names
+
+    def next_gesture(self):
+        return GESTURES[self.next_moves[0]]
+
+    def observe_gestures(self, player_gesture, own_gesture):
+        self.observe(np.array([GESTURES.index(player_gesture)], dtype=np.int8),
+                     np.array([GESTURES.index(own_gesture)], dtype=np.int8))
+
+
+class RandomStrategy(Strategy):
+    name = "random"
+
+
+class MarkovStrategy(Strategy):
+    """Predicts the player's next move from their last `order` moves and plays what beats it.
+
+    Counts live in a (games, 3 ** order, 3) table covering only the last
+    `window` rounds: a ring buffer remembers which cell each round added, so
+    the oldest round is subtracted when a new one comes in.
+    """
+
+    name = "markov"
+
+    def __init__(self, games=1, order=2, window=50, rng=None):
+        self.order = order
+        self.window = window
+        self.contexts = MOVES ** order
+        super().__init__(games, rng)
+
+    def reset(self):
+        self.counts = np.zeros((self.games, self.contexts * MOVES), dtype=np.int32)
+        self.history = np.full((self.games, self.window), -1, dtype=np.int32)  # Cell added by each round
+        self.position = 0
+        self.filled = 0  # Rounds currently held in the ring buffer
+        self.context = np.zeros(self.games, dtype=np.int32)  # Last `order` player moves in base 3
+        self.seen = 0  # Player moves seen, up to `order`
+        super().reset()
+
+    def observe(self, player_moves, own_moves):
+        player_moves = np.asarray(player_moves, dtype=np.int32)
+        if self.seen >= self.order:
+            # Only moves that follow a full context are counted
+            if self.filled == self.window:
+                self.counts[self.rows, self.history[:, self.position]] -= 1
+            cells = self.context * MOVES + player_moves
+            self.counts[self.rows, cells] += 1
+            self.history[:, self.position] = cells
+            self.position = (self.position + 1) % self.window
+            self.filled = min(self.filled + 1, self.window)
+        self.seen = min(self.seen + 1, self.order)
+        self.context = (self.context * MOVES + player_moves) % self.contexts
+        self.next_moves = counter_move(self.predict()).astype(np.int8)
+
+    def predict(self):
+        start = self.context * MOVES
+        counts = self.counts[self.rows[:, None], start[:, None] + np.arange(MOVES)]
+        # Noise below 1 only breaks ties between equal counts; no data at all gives a random guess
+        return np.argmax(counts + self.rng.random((self.games, MOVES)) * 0.5, axis=1)
+
+
+class FrequencyStrategy(MarkovStrategy):
+    """Plays against the player's most frequent move over the last `window` rounds."""
+
+    name = "frequency"
+
+    def __init__(self, games=1, window=50, rng=None):
+        super().__init__(games, order=0, window=window, rng=rng)
+
+
+class MixtureStrategy(Strategy):
+    """Hedge over several experts: each expert is weighted by how it would have done lately.
+
+    Weights are exponential in each expert's discounted score, so experts that
+    stopped working lose influence within a few rounds. The next move is drawn
+    from the experts' weights.
+    """
+
+    name = "mixture"
+
+    def __init__(self, games=1, experts=None, learning_rate=0.5, discount=0.9, rng=None):
+        self.learning_rate = learning_rate
+        self.discount = discount
+        rng = rng if rng is not None else np.random.default_rng()
+        self.experts = experts or [
+            RandomStrategy(games, rng),
+            FrequencyStrategy(games, rng=rng),
+            MarkovStrategy(games, order=1, rng=rng),
+            MarkovStrategy(games, order=2, rng=rng),
+        ]
+        super().__init__(games, rng)
+
+    def reset(self):
+        for expert in self.experts:
+            expert.reset()
+        self.scores = np.zeros((self.games, len(self.experts)))
+        self.next_moves = self.choose()
+
+    def choose(self):
+        expert_moves = np.stack([expert.moves() for expert in self.experts], axis=1)
+        weights = np.exp(self.learning_rate * (self.scores - self.scores.max(axis=1, keepdims=True)))
+        cumulative = np.cumsum(weights, axis=1)
+        draws = self.rng.random(self.games)[:, None] * cumulative[:, -1:]
+        chosen = np.minimum((draws > cumulative).sum(axis=1), len(self.experts) - 1)
+        return expert_moves[self.rows, chosen]
+
+    def observe(self, player_moves, own_moves):
+        player_moves = np.asarray(player_moves, dtype=np.int8)
+        expert_moves = np.stack([expert.moves() for expert in self.experts], axis=1)
+        payoff = PAYOFF[(expert_moves - player_moves[:, None]) % MOVES]
+        self.scores = self.scores * self.discount + payoff
+        for expert in self.experts:
+            expert.observe(player_moves, own_moves)
+        self.next_moves = self.choose()
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "frequency": FrequencyStrategy,
+    "markov": MarkovStrategy,
+    "mixture": MixtureStrategy,
+}
+
+
+def create_strategy(name, games=1, rng=None):
+    return STRATEGIES[name](games, rng=rng)
+
+
+class ScriptedPlayer:
+    """A simulated player for `games` games at once."""
+
+    def __init__(self, games, rng):
+        self.games = games
+        self.rng = rng
+
+    def moves(self, round_index):
+        raise NotImplementedError
+
+    def observe(self, own_moves, opponent_moves):
+        pass
+
+
+class RandomPlayer(ScriptedPlayer):
+    def moves(self, round_index):
+        return self.rng.integers(0, MOVES, self.games, dtype=np.int8)
+
+
+class BiasedPlayer(ScriptedPlayer):
+    """Favours rock, like many first-time players."""
+
+    probabilities = (0.5, 0.25, 0.25)
+
+    def moves(self, round_index):
+        return self.rng.choice(MOVES, self.games, p=self.probabilities).astype(np.int8)
+
+
+class CyclePlayer(ScriptedPlayer):
+    """Rock, paper, scissors, rock, ... from a random starting point."""
+
+    def __init__(self, games, rng):
+        super().__init__(games, rng)
+        self.offset = rng.integers(0, MOVES, games)
+
+    def moves(self, round_index):
+        return ((self.offset + round_index) % MOVES).astype(np.int8)
+
+
+class WinStayLoseShiftPlayer(ScriptedPlayer):
+    """Repeats a winning move, otherwise switches to what would have beaten the opponent."""
+
+    def __init__(self, games, rng):
+        super().__init__(games, rng)
+        self.next_moves = rng.integers(0, MOVES, games, dtype=np.int8)
+
+    def moves(self, round_index):
+        return self.next_moves
+
+    def observe(self, own_moves, opponent_moves):
+        won = PAYOFF[(own_moves - opponent_moves) % MOVES] > 0
+        self.next_moves = np.where(won, own_moves, counter_move(opponent_moves)).astype(np.int8)
+
+
+PLAYERS = {
+    "random": RandomPlayer,
+    "biased": BiasedPlayer,
+    "cycle": CyclePlayer,
+    "win-stay-lose-shift": WinStayLoseShiftPlayer,
+}
+
+
+def simulate(strategy_name, player_name, games=10000, rounds=100, seed=None):
+    """Plays `games` parallel games of `rounds` rounds; returns the strategy's win/tie/loss rates and speed."""
+    rng = np.random.default_rng(seed)
+    strategy = create_strategy(strategy_name, games, rng)
+    player = PLAYERS[player_name](games, rng)
+    totals = np.zeros(3, dtype=np.int64)  # Ties, strategy wins, strategy losses (PAYOFF order)
+    started = time.perf_counter()
+    for round_index in range(rounds):
+        own_moves = strategy.moves()
+        player_moves = player.moves(round_index)
+        totals += np.bincount((own_moves - player_moves) % MOVES, minlength=3)
+        strategy.observe(player_moves, own_moves)
+        player.observe(player_moves, own_moves)
+    elapsed = time.perf_counter() - started
+    played = games * rounds
+    return {
+        "strategy": strategy_name,
+        "player": player_name,
+        "rounds": played,
+        "win_rate": totals[1] / played,
+        "tie_rate": totals[0] / played,
+        "loss_rate": totals[2] / played,
+        "rounds_per_second": played / elapsed if elapsed else float("inf"),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare opponent strategies against scripted players")
+    parser.add_argument("--games", type=int, default=100000, help="games played in parallel")
+    parser.add_argument("--rounds", type=int, default=50, help="rounds per game")
+    parser.add_argument("--strategy", choices=STRATEGIES, action="append", help="default: all")
+    parser.add_argument("--player", choices=PLAYERS, action="append", help="default: all")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    print(f"{'strategy':>10} {'player':>20} {'win':>7} {'tie':>7} {'loss':>7} {'rounds/s':>12}")
+    for strategy_name in args.strategy or STRATEGIES:
+        for player_name in args.player or PLAYERS:
+            result = simulate(strategy_name, player_name, args.games, args.rounds, args.seed)
+            print(f"{strategy_name:>10} {player_name:>20} {result['win_rate']:7.1%} {result['tie_rate']:7.1%} "
+                  f"{result['loss_rate']:7.1%} {result['rounds_per_second']:12,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
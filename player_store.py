@@ -0,0 +1,160 @@
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    matches INTEGER NOT NULL DEFAULT 0,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    ties INTEGER NOT NULL DEFAULT 0,
+    rounds INTEGER NOT NULL DEFAULT 0,
+    rounds_won INTEGER NOT NULL DEFAULT 0,
+    last_played REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    player_score INTEGER NOT NULL,
+    opponent_score INTEGER NOT NULL,
+    winner TEXT NOT NULL,
+    rounds INTEGER NOT NULL,
+    ended_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    match_id INTEGER NOT NULL REFERENCES matches(id),
+    round INTEGER NOT NULL,
+    player_choice TEXT NOT NULL,
+    opponent_choice TEXT NOT NULL,
+    winner TEXT NOT NULL,
+    PRIMARY KEY (match_id, round)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS matches_player_time ON matches (player, ended_at);
+CREATE INDEX IF NOT EXISTS matches_time ON matches (ended_at);
+CREATE INDEX IF NOT EXISTS players_ranking ON players (wins DESC, matches);
+"""
+
+
+class PlayerStore:
+    """Match and round history in SQLite, written by a background thread.
+
+    record_match() only queues the match; the writer commits whatever has
+    queued up in one transaction, then refreshes the leaderboard, recent
+    matches and the stats of the players it just wrote. The GUI reads those
+    precomputed results without touching the database. `on_update` is called
+    from the writer thread after every refresh.
+    """
+
+    def __init__(self, path, top_count=5, recent_count=10, batch_interval=0.5, on_update=None):
+        self.path = path
+        self.top_count = top_count
+        self.recent_count = recent_count
+        self.batch_interval = batch_interval  # Longest a match waits for others to share its transaction
+        self.on_update = on_update
+        self.queue = queue.Queue()
+        self.top_players = []  # (name, wins, matches, win rate)
+        self.recent_matches = []  # (player, opponent, player score, opponent score, winner, ended at)
+        self.player_stats = {}  # name -> dict, for players seen since startup
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="player-store", daemon=True)
+        self._thread.start()
+
+    def record_match(self, player, opponent, rounds, player_score, opponent_score, winner, ended_at=None):
+        """Queues a finished match; rounds are (player choice, opponent choice, winner) tuples."""
+        if not self._thread.is_alive():
+            return  # The database never opened; nothing would write the match
+        self.queue.put({
+            "player": player, "opponent": opponent, "rounds": list(rounds),
+            "player_score": player_score, "opponent_score": opponent_score, "winner": winner,
+            "ended_at": ended_at if ended_at is not None else time.time(),
+        })
+
+    def stats_for(self, name):
+        return self.player_stats.get(name)
+
+    def _run(self):
+        try:
+            connection = sqlite3.connect(self.path)
+            # WAL lets readers (reports, other tools) work while the booth writes
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._refresh(connection, ())
+        except sqlite3.Error as e:
+            self.error = f"Player store unavailable: {e}"
+            return
+
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.batch_interval
+            while batch[-1] is not None:
+                try:
+                    batch.append(self.queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            closing = batch[-1] is None
+            matches = [match for match in batch if match is not None]
+            if matches:
+                try:
+                    with connection:
+                        for match in matches:
+                            self._insert(connection, match)
+                    self._refresh(connection, {match["player"] for match in matches})
+                except sqlite3.Error as e:
+                    self.error = f"Could not save matches: {e}"
+            if closing:
+                break
+        connection.close()
+
+    def _insert(self, connection, match):
+        cursor = connection.execute(
+            "INSERT INTO matches (player, opponent, player_score, opponent_score, winner, rounds, ended_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (match["player"], match["opponent"], match["player_score"], match["opponent_score"],
+             match["winner"], len(match["rounds"]), match["ended_at"]))
+        connection.executemany(
+            "INSERT INTO rounds (match_id, round, player_choice, opponent_choice, winner) VALUES (?, ?, ?, ?, ?)",
+            [(cursor.lastrowid, index + 1, *round_) for index, round_ in enumerate(match["rounds"])])
+        # Per-player totals are kept up to date here, so rankings never scan the matches table
+        winner = match["winner"]
+        connection.execute("INSERT OR IGNORE INTO players (name) VALUES (?)", (match["player"],))
+        connection.execute(
+            "UPDATE players SET matches = matches + 1, wins = wins + ?, losses = losses + ?, ties = ties + ?, "
+            "rounds = rounds + ?, rounds_won = rounds_won + ?, last_played = ? WHERE name = ?",
+            (winner == "player", winner == "computer", winner == "tie", len(match["rounds"]),
+             match["player_score"], match["ended_at"], match["player"]))
+
+    def _refresh(self, connection, players):
+        top_players = [
+            (name, wins, matches, wins / matches if matches else 0.0)
+            for name, wins, matches in connection.execute(
+                "SELECT name, wins, matches FROM players ORDER BY wins DESC, matches LIMIT ?", (self.top_count,))
+        ]
+        recent_matches = connection.execute(
+            "SELECT player, opponent, player_score, opponent_score, winner, ended_at FROM matches "
+            "ORDER BY ended_at DESC LIMIT ?", (self.recent_count,)).fetchall()
+        player_stats = dict(self.player_stats)
+        for name in players:
+            row = connection.execute(
+                "SELECT matches, wins, losses, ties, rounds, rounds_won FROM players WHERE name = ?", (name,)).fetchone()
+            if row:
+                matches, wins, losses, ties, rounds, rounds_won = row
+                player_stats[name] = {"matches": matches, "wins": wins, "losses": losses, "ties": ties,
+                                      "win_rate": wins / matches if matches else 0.0,
+                                      "round_win_rate": rounds_won / rounds if rounds else 0.0}
+        # Swapped in whole, so readers on other threads never see half an update
+        self.top_players, self.recent_matches, self.player_stats = top_players, recent_matches, player_stats
+        if self.on_update:
+            self.on_update()
+
+    def close(self):
+        if self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join(timeout=5)
+        if self.error:
+            print(self.error, file=sys.stderr)
@@ -0,0 +1,185 @@
+import json
+import queue
+import struct
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+MAGIC = b"RPSREC1\0"
+# Every chunk: kind, payload length, timestamp (perf_counter seconds), frame ID
+CHUNK_HEADER = struct.Struct("<4sIdq")
+FRAME_HEADER = struct.Struct("<HHB")  # Height, width, encoding
+RAW, JPEG = 0, 1
+
+FRAME = b"FRAM"  # FRAME_HEADER + raw BGR bytes or a JPEG
+LANDMARKS = b"LMKS"  # Hand count byte + (n, 21, 3) float32 array
+GESTURE = b"GEST"  # JSON {"player", "gesture", "hand"}; hand indexes the frame's LMKS chunk
+EVENT = b"EVNT"  # JSON {"name", ...}
+DROPS = b"DROP"  # JSON drop counts, written once when the recording is closed
+
+
+class SessionRecorder:
+    """Records frames, landmarks, gestures and game events to a chunked file from a background thread.
+
+    The record_* methods never block: items go through a bounded queue, and
+    when the writer falls behind, frames are dropped first (the last
+    `reserved` queue slots are kept for the small records) and counted in
+    `dropped`. Frames are JPEG-encoded on the writer thread unless
+    jpeg_quality is None, in which case raw BGR bytes are stored.
+    """
+
+    def __init__(self, path, max_queue=64, reserved=16, jpeg_quality=80):
+        self.path = path
+        self.jpeg_quality = jpeg_quality
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.frame_limit = max_queue - reserved
+        self.dropped = {"frames": 0, "records": 0}
+        self.written = {"frames": 0, "records": 0}
+        self.origin = time.perf_counter()
+        self.error = None  # Set by the writer when the disk fails; recording stops there
+        self._closed = False  # No more records accepted
+        self._closing = False
+        self._file = open(path, "wb")
+        header = json.dumps({"version": 1, "created": time.time(), "clock_origin": self.origin,
+                             "frame_encoding": "jpeg" if jpeg_quality is not None else "raw"}).encode("utf-8")
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+        self._thread = threading.Thread(target=self._run, name="session-recorder", daemon=True)
+        self._thread.start()
+
+    def record_frame(self, frame, timestamp, frame_id=-1):
+        """Queues a BGR frame; the caller must not modify it afterwards. Returns False if it was dropped."""
+        if self._closed or self.queue.qsize() >= self.frame_limit:
+            self.dropped["frames"] += 1
+            return False
+        return self._put((FRAME, timestamp, frame_id, frame), "frames")
+
+    def record_landmarks(self, hand_points, timestamp, frame_id=-1):
+        """Queues the (21, 3) landmark arrays of every hand found in a frame."""
+        points = np.asarray(hand_points, dtype=np.float32).reshape(-1, 21, 3)
+        return self._put((LANDMARKS, timestamp, frame_id, points), "records")
+
+    def record_gesture(self, player, gesture, timestamp, frame_id=-1, hand=None):
+        """`hand` is the index of the player's hand among the frame's recorded landmarks."""
+        data = {"player": player, "gesture": gesture}
+        if hand is not None:
+            data["hand"] = hand
+        return self._put((GESTURE, timestamp, frame_id, data), "records")
+
+    def record_event(self, name, **data):
+        return self._put((EVENT, time.perf_counter(), -1, {"name": name, **data}), "records")
+
+    def _put(self, item, kind):
+        if self._closed:
+            self.dropped[kind] += 1
+            return False
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.dropped[kind] += 1
+            return False
+        return True
+
+    def _run(self):
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                kind, timestamp, frame_id, data = item
+                if kind == FRAME:
+                    try:
+                        payload = self.encode_frame(data)
+                    except (ValueError, cv2.error):
+                        self.dropped["frames"] += 1
+                        continue
+                    self.written["frames"] += 1
+                else:
+                    if kind == LANDMARKS:
+                        payload = struct.pack("<B", len(data)) + data.tobytes()
+                    else:
+                        payload = json.dumps(data).encode("utf-8")
+                    self.written["records"] += 1
+                self._write_chunk(kind, timestamp, frame_id, payload)
+            self._write_chunk(DROPS, time.perf_counter(), -1, json.dumps(self.dropped).encode("utf-8"))
+        except OSError as e:
+            # Full or vanished disk: stop here, record_* drops everything from now on
+            self._closed = True
+            self.error = f"Session recording stopped: {e}"
+        finally:
+            try:
+                self._file.close()
+            except OSError:
+                pass  # Buffered data could not be flushed; the chunks before it are still readable
+
+    def encode_frame(self, frame):
+        height, width = frame.shape[:2]
+        if self.jpeg_quality is None:
+            return FRAME_HEADER.pack(height, width, RAW) + np.ascontiguousarray(frame).tobytes()
+        ok, data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+        if not ok:
+            raise ValueError("Could not encode frame")
+        return FRAME_HEADER.pack(height, width, JPEG) + data.tobytes()
+
+    def _write_chunk(self, kind, timestamp, frame_id, payload):
+        self._file.write(CHUNK_HEADER.pack(kind, len(payload), timestamp, frame_id))
+        self._file.write(payload)
+
+    def close(self):
+        """Writes what is queued, then the drop counts; prints a warning if anything was dropped."""
+        if self._closing:
+            return
+        self._closing = True
+        self._closed = True
+        if self._thread.is_alive():
+            try:
+                self.queue.put(None, timeout=1.0)
+            except queue.Full:
+                # Still a full queue behind after a second: give up on the backlog. The chunks
+                # already written stay readable, only the trailing DROP chunk is missing.
+                pass
+        self._thread.join(timeout=5.0)
+        if self.error:
+            print(self.error, file=sys.stderr)
+        if any(self.dropped.values()):
+            print(f"Session recorder dropped {self.dropped['frames']} frames and "
+                  f"{self.dropped['records']} records: the disk could not keep up", file=sys.stderr)
+
+
+def read_recording(path, decode_frames=True):
+    """Yields (kind, timestamp, frame ID, data) for every chunk of a recording.
+
+    Frames come back as BGR arrays (or encoded bytes if decode_frames is
+    False), landmarks as (n, 21, 3) float32 arrays, everything else as dicts.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a session recording")
+        header_length, = struct.unpack("<I", f.read(4))
+        f.read(header_length)
+        while True:
+            header = f.read(CHUNK_HEADER.size)
+            if len(header) < CHUNK_HEADER.size:
+                break  # End of file, or a recording cut short by a crash
+            kind, length, timestamp, frame_id = CHUNK_HEADER.unpack(header)
+            payload = f.read(length)
+            if len(payload) < length:
+                break
+            if kind == FRAME:
+                data = decode_frame(payload) if decode_frames else payload
+            elif kind == LANDMARKS:
+                data = np.frombuffer(payload, dtype=np.float32, offset=1).reshape(payload[0], 21, 3)
+            else:
+                data = json.loads(payload)
+            yield kind, timestamp, frame_id, data
+
+
+def decode_frame(payload):
+    height, width, encoding = FRAME_HEADER.unpack_from(payload)
+    data = np.frombuffer(payload, dtype=np.uint8, offset=FRAME_HEADER.size)
+    if encoding == RAW:
+        return data.reshape(height, width, 3)
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
@@ -0,0 +1,106 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRectF, QSize
+from PyQt5.QtGui import QBrush, QColor, QFont, QPainter, QPen
+from PyQt5.QtWidgets import QFrame, QListView, QStyle, QStyledItemDelegate
+
+
+class RoundResultsModel(QAbstractListModel):
+    """Exposes the game's results list ((player_choice, computer_choice, result_text) tuples) to a view."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = []
+
+    def set_results(self, results):
+        # Constant time whatever the match length: the view asks only for the rows it shows
+        self.beginResetModel()
+        self.results = results
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.results)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.UserRole:
+            return self.results[index.row()]
+        if role == Qt.DisplayRole:
+            return self.results[index.row()][2]
+        return None
+
+
+class RoundResultDelegate(QStyledItemDelegate):
+    """Paints one round as a card: player image, computer image and the result text."""
+
+    WIDTH = 200
+    HEIGHT = 180
+    IMAGE_SIZE = 60
+
+    def __init__(self, pixmap_cache, parent=None):
+        super().__init__(parent)
+        self.pixmap_cache = pixmap_cache
+        # Styling objects are built once and shared by every card
+        self.border_pen = QPen(QColor("#008080"), 3)
+        self.hover_pen = QPen(QColor("#00b3b3"), 3)
+        self.background_brush = QBrush(QColor(0, 128, 128, 40))
+        self.hover_brush = QBrush(QColor(0, 128, 128, 80))
+        self.text_pen = QPen(QColor("white"))
+        self.round_pen = QPen(QColor("#AAAAAA"))
+        self.result_font = QFont("Segoe UI", 14, QFont.Bold)
+        self.round_font = QFont("Segoe UI", 9)
+
+    def sizeHint(self, option, index):
+        return QSize(self.WIDTH, self.HEIGHT)
+
+    def paint(self, painter, option, index):
+        player_choice, computer_choice, result_text = index.data(Qt.UserRole)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        rect = option.rect
+        ratio = painter.device().devicePixelRatioF()
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self.hover_pen if hovered else self.border_pen)
+        painter.setBrush(self.hover_brush if hovered else self.background_brush)
+        painter.drawRoundedRect(QRectF(rect).adjusted(1.5, 1.5, -1.5, -1.5), 15, 15)
+
+        painter.setPen(self.round_pen)
+        painter.setFont(self.round_font)
+        painter.drawText(rect.adjusted(12, 8, -12, 0), Qt.AlignLeft | Qt.AlignTop, f"#{index.row() + 1}")
+
+        image_x = rect.x() + (rect.width() - self.IMAGE_SIZE) // 2
+        for row, choice in enumerate((player_choice, computer_choice)):
+            pixmap = self.pixmap_cache.get(choice, self.IMAGE_SIZE, self.IMAGE_SIZE, ratio)
+            painter.drawPixmap(image_x, rect.y() + 10 + row * (self.IMAGE_SIZE + 4), pixmap)
+
+        painter.setPen(self.text_pen)
+        painter.setFont(self.result_font)
+        text_rect = rect.adjusted(4, 10 + 2 * (self.IMAGE_SIZE + 4), -4, -6)
+        painter.drawText(text_rect, Qt.AlignCenter, result_text)
+        painter.restore()
+
+
+class RoundResultsView(QListView):
+    """Scrollable grid of round cards that only paints the rounds currently visible."""
+
+    def __init__(self, pixmap_cache, parent=None):
+        super().__init__(parent)
+        self.results_model = RoundResultsModel(self)
+        self.setModel(self.results_model)
+        self.setItemDelegate(RoundResultDelegate(pixmap_cache, self))
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)  # Lets the view lay out rows without asking for every size hint
+        self.setLayoutMode(QListView.Batched)
+        self.setSpacing(8)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setMouseTracking(True)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setStyleSheet("background-color: transparent;")
+
+    def set_results(self, results):
+        self.results_model.set_results(results)
+        self.scrollToTop()
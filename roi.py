@@ -0,0 +1,72 @@
+import numpy as np
+
+
+class HandRoiTracker:
+    """Keeps a square box around the last detected hand so inference can run on a crop.
+
+    Boxes are in pixels of the full frame. When the hand is not found inside
+    the crop the caller resets the tracker and searches the full frame again.
+
+    The box stays put while the hand is well inside it. MediaPipe's video
+    mode tracks the hand in the coordinates of the image it was given, so a
+    crop that moved every frame would throw its tracking off and force a
+    full palm detection; the box is only moved when the hand nears its edge
+    or has become much smaller than it.
+    """
+
+    def __init__(self, padding=0.5, min_size=0.3, edge_margin=0.1):
+        self.padding = padding  # Extra margin around the hand, as a fraction of its size
+        self.min_size = min_size  # Smallest crop side, as a fraction of the shorter frame side
+        self.edge_margin = edge_margin  # Box moves once the hand is this close to its edge, as a fraction of its side
+        self.box = None
+        self.moves = 0  # Times the box was placed or moved; each one costs the model its tracking
+        self.misses = 0  # Crops without a hand, each followed by a full-frame search
+
+    def reset(self):
+        self.box = None
+
+    def crop(self, frame):
+        """Returns (image, box); box is None when the whole frame should be searched."""
+        if self.box is None:
+            return frame, None
+        x0, y0, x1, y1 = self.box
+        return np.ascontiguousarray(frame[y0:y1, x0:x1]), self.box
+
+    def remap(self, hand_landmarks, box, frame_shape):
+        """Converts landmarks normalized to the crop into landmarks normalized to the full frame, in place."""
+        if box is None:
+            return
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = box
+        scale_x = (x1 - x0) / width
+        scale_y = (y1 - y0) / height
+        for landmark in hand_landmarks.landmark:
+            landmark.x = landmark.x * scale_x + x0 / width
+            landmark.y = landmark.y * scale_y + y0 / height
+            landmark.z = landmark.z * scale_x  # z shares the x scale in MediaPipe
+
+    def update(self, hand_landmarks, frame_shape):
+        height, width = frame_shape[:2]
+        xs = [landmark.x for landmark in hand_landmarks.landmark]
+        ys = [landmark.y for landmark in hand_landmarks.landmark]
+        left, right = min(xs) * width, max(xs) * width
+        top, bottom = min(ys) * height, max(ys) * height
+        hand_size = max(right - left, bottom - top)
+        side = max(hand_size * (1 + 2 * self.padding), self.min_size * min(width, height))
+        side = min(side, width, height)
+        if self.box is not None and self.holds(left, top, right, bottom, side):
+            return
+
+        x0 = int(min(max((left + right) / 2 - side / 2, 0), width - side))
+        y0 = int(min(max((top + bottom) / 2 - side / 2, 0), height - side))
+        box = (x0, y0, x0 + int(side), y0 + int(side))
+        if box != self.box:
+            self.box = box
+            self.moves += 1
+
+    def holds(self, left, top, right, bottom, wanted_side):
+        """Whether the current box still fits a hand with these pixel bounds."""
+        x0, y0, x1, y1 = self.box
+        margin = self.edge_margin * (x1 - x0)
+        inside = left >= x0 + margin and right <= x1 - margin and top >= y0 + margin and bottom <= y1 - margin
+        return inside and wanted_side >= (x1 - x0) / 2  # Hand moved away: a tighter box is worth a move
@@ -0,0 +1,44 @@
+import threading
+
+
+class InferenceScheduler:
+    """Tells the tracking pipeline how much work the current game phase needs.
+
+    FULL     - capture, inference and preview at full rate (player is showing a gesture)
+    PREVIEW  - low-rate preview only, no inference (countdown, round result)
+    PAUSED   - no capture at all (results screen, start screen)
+
+    The GUI thread calls set_mode(); the capture and tracking threads read it.
+    """
+
+    FULL = "full"
+    PREVIEW = "preview"
+    PAUSED = "paused"
+
+    def __init__(self, mode=FULL, preview_fps=10.0):
+        self._cond = threading.Condition()
+        self.mode = mode
+        self.preview_interval = 1.0 / preview_fps
+        # Bumped every time FULL is entered, so the tracker can drop gesture state from the previous round
+        self.full_generation = 0
+
+    def set_mode(self, mode):
+        with self._cond:
+            if mode == self.mode:
+                return
+            if mode == self.FULL:
+                self.full_generation += 1
+            self.mode = mode
+            self._cond.notify_all()
+
+    def wait_for_change(self, mode, timeout):
+        """Blocks until the mode differs from `mode` or `timeout` seconds pass; returns the current mode."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.mode != mode, timeout)
+            return self.mode
+
+    def wait_while_paused(self, timeout=None):
+        """Blocks while PAUSED (up to `timeout` seconds) and returns the current mode."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.mode != self.PAUSED, timeout)
+            return self.mode
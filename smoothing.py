@@ -0,0 +1,62 @@
+from collections import deque
+
+
+class GestureSmoother:
+    """Confidence-weighted vote over a sliding time window, with enter/exit hysteresis.
+
+    Every frame casts one vote (a gesture label, or None for "no gesture")
+    weighted by the detector's confidence. A label becomes the stable gesture
+    once it holds at least `enter_ratio` of the window weight and the window
+    spans at least `min_span_ms`; it stays stable until its share drops below
+    `exit_ratio`. Updates are O(1): vote totals are kept as running sums.
+    """
+
+    def __init__(self, window_ms=250, min_span_ms=60, enter_ratio=0.6, exit_ratio=0.4):
+        self.window = window_ms / 1000.0
+        self.min_span = min_span_ms / 1000.0
+        self.enter_ratio = enter_ratio
+        self.exit_ratio = exit_ratio
+        self.votes = deque()  # (timestamp, label, weight), oldest first
+        self.totals = {}
+        self.total_weight = 0.0
+        self.stable = None
+
+    def reset(self):
+        self.votes.clear()
+        self.totals = {}
+        self.total_weight = 0.0
+        self.stable = None
+
+    def share(self, label):
+        if self.total_weight <= 0:
+            return 0.0
+        return self.totals.get(label, 0.0) / self.total_weight
+
+    def update(self, label, confidence, timestamp):
+        """Adds a vote at `timestamp` (seconds); returns the new gesture when a non-None label becomes stable."""
+        weight = max(float(confidence), 1e-3)
+        self.votes.append((timestamp, label, weight))
+        self.totals[label] = self.totals.get(label, 0.0) + weight
+        self.total_weight += weight
+
+        while self.votes and timestamp - self.votes[0][0] > self.window:
+            _, old_label, old_weight = self.votes.popleft()
+            self.totals[old_label] -= old_weight
+            self.total_weight -= old_weight
+        if len(self.votes) == 1:
+            # Resync the running sums so float error cannot build up
+            self.totals = {label: weight}
+            self.total_weight = weight
+
+        if self.stable is not None and self.share(self.stable) >= self.exit_ratio:
+            return None  # Hysteresis: keep the current gesture
+
+        leader = max(self.totals, key=self.totals.get)
+        span = timestamp - self.votes[0][0]
+        if span >= self.min_span and self.share(leader) >= self.enter_ratio:
+            changed = leader != self.stable
+            self.stable = leader
+            return leader if changed else None
+
+        self.stable = None
+        return None
@@ -1,238 +1,115 @@
+import time
+
+STARTUP_ORIGIN = time.perf_counter()  # Taken before the heavy imports so the startup report covers them
+
 import sys
-import cv2
-import mediapipe as mp
-import random
-import math
+import os
+import argparse
+import importlib
 from PyQt5.QtWidgets import (QApplication, QWidget, QLabel, QPushButton,
                              QVBoxLayout, QHBoxLayout, QStackedWidget,
-                             QGraphicsDropShadowEffect, QMessageBox, QFrame, QLineEdit)
-from PyQt5.QtGui import (QImage, QPixmap, QFont, QIcon, QColor, QLinearGradient,
-                         QPainter, QBrush, QPen, QRadialGradient)
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve
-
-
-class HandTrackingThread(QThread):
-    image_data = pyqtSignal(QImage)
-    gesture_detected = pyqtSignal(str, float, float)
-    error_signal = pyqtSignal(str)
-
-    def __init__(self):
+                             QGraphicsDropShadowEffect, QMessageBox, QFrame, QLineEdit, QShortcut)
+from PyQt5.QtGui import (QFont, QIcon, QColor, QLinearGradient,
+                         QPainter, QBrush, QPen, QRadialGradient, QKeySequence)
+from PyQt5.QtCore import Qt, QObject, QTimer, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve
+
+# OpenCV, MediaPipe and NumPy are only imported by ModuleLoader once the window is on screen
+from assets import PixmapCache
+from game_core import OPPONENT, PLAYER, GameState
+from metrics import MetricsLogger, format_metrics
+from results_view import RoundResultDelegate, RoundResultsView
+from scheduler import InferenceScheduler
+from startup import StartupTimer
+from tracing import tracer
+
+
+class ModuleLoader(QThread):
+    """Imports heavy modules off the GUI thread so the window can appear first."""
+    loaded = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, module_names):
         super().__init__()
-        self.cap = None
-        self._run_flag = True
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=1,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.7
-        )
-        self.mp_draw = mp.solutions.drawing_utils
-        self.prev_gesture = None
-        self.gesture_buffer = []
-        self.buffer_size = 3  # Number of frames for gesture smoothing
+        self.module_names = module_names
 
     def run(self):
-        try:
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
-                self.error_signal.emit("Could not open camera!")
+        for name in self.module_names:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                self.failed.emit(f"Error loading {name}: {str(e)}")
                 return
+        self.loaded.emit()
 
-            while self._run_flag:
-                ret, frame = self.cap.read()
-                if not ret:
-                    self.error_signal.emit("Error reading frame.")
-                    break
-
-                frame = cv2.flip(frame, 1)
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = self.hands.process(rgb_frame)
-
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        self.mp_draw.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
-                                                    landmark_drawing_spec=self.mp_draw.DrawingSpec(color=(255, 255, 255), thickness=2, circle_radius=2),
-                                                    connection_drawing_spec=self.mp_draw.DrawingSpec(color=(128, 128, 128), thickness=1))
-
-                        gesture = self.detect_gesture(hand_landmarks)
-
-                        if hand_landmarks.landmark:
-                            # Use wrist position for x, y coordinates (more stable)
-                            x = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST].x
-                            y = hand_landmarks.landmark[self.mp_hands.HandLandmark.WRIST].y
-
-                            if gesture:
-                                # Gesture smoothing using a buffer
-                                self.gesture_buffer.append(gesture)
-                                if len(self.gesture_buffer) >= self.buffer_size:
-                                    # Find the most frequent gesture in the buffer
-                                    most_frequent_gesture = max(set(self.gesture_buffer), key=self.gesture_buffer.count, default=None)
-
-                                    # Only emit the gesture if it has changed
-                                    if most_frequent_gesture != self.prev_gesture:
-                                        self.gesture_detected.emit(most_frequent_gesture, x, y)
-                                        self.prev_gesture = most_frequent_gesture  # Update previous gesture
-                                    self.gesture_buffer = [] # Clear buffer
-                            else:
-                                # No gesture detected: reset buffer and previous gesture
-                                self.prev_gesture = None
-                                self.gesture_buffer = []
-
-
-
-                height, width, channel = frame.shape
-                bytes_per_line = 3 * width
-                q_img = QImage(frame.data, width, height, bytes_per_line, QImage.Format_RGB888).rgbSwapped()
-                self.image_data.emit(q_img)
 
-            self.cap.release()
-        except Exception as e:
-            error_message = f"Error in hand tracking thread: {str(e)}"  # More descriptive error
-            self.error_signal.emit(error_message)
-
-    def calculate_distance(self, point1, point2):
-        return math.sqrt((point1.x - point2.x)**2 + (point1.y - point2.y)**2)
-
-    def detect_gesture(self, landmarks):
-        thumb_tip = landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        index_tip = landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        middle_tip = landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        ring_tip = landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP]
-        pinky_tip = landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP]
-
-        thumb_mcp = landmarks.landmark[self.mp_hands.HandLandmark.THUMB_MCP]
-        index_mcp = landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_MCP]
-        middle_mcp = landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_MCP]
-        ring_mcp = landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_MCP]
-        pinky_mcp = landmarks.landmark[self.mp_hands.HandLandmark.PINKY_MCP]
-
-        wrist = landmarks.landmark[self.mp_hands.HandLandmark.WRIST]
-
-        # Calculate distances for gesture recognition
-        thumb_index_dist = self.calculate_distance(thumb_tip, index_mcp)
-        thumb_middle_dist = self.calculate_distance(thumb_tip, middle_mcp)
-        index_middle_dist = self.calculate_distance(index_tip, middle_tip)
-
-
-        # Check finger extension based on y-coordinate relative to MCP and wrist
-        index_finger_extended = index_tip.y < index_mcp.y and index_tip.y < wrist.y
-        middle_finger_extended = middle_tip.y < middle_mcp.y and middle_tip.y < wrist.y
-        ring_finger_extended = ring_tip.y < ring_mcp.y and ring_tip.y < wrist.y
-        pinky_finger_extended = pinky_tip.y < pinky_mcp.y and pinky_tip.y < wrist.y
-
-        # Thumb extension is more complex due to its movement range
-        thumb_extended = thumb_tip.x > thumb_mcp.x if thumb_tip.x > thumb_mcp.x else thumb_tip.x < wrist.x
-
-        # --- Improved Gesture Recognition Logic ---
-
-        # Rock: All fingers curled
-        thumb_curl_Rock = thumb_tip.y > thumb_mcp.y
-        index_curl_Rock = index_tip.y > index_mcp.y
-        middle_curl_Rock = middle_tip.y > middle_mcp.y
-        ring_curl_Rock = ring_tip.y > ring_mcp.y
-        pinky_curl_Rock = pinky_tip.y > pinky_mcp.y
-
-
-        if thumb_curl_Rock and index_curl_Rock and middle_curl_Rock and ring_curl_Rock and pinky_curl_Rock:
-            return "Rock"
-
-        # Paper: All fingers extended and thumb extended and up.
-        elif index_finger_extended and middle_finger_extended and ring_finger_extended and pinky_finger_extended and thumb_extended and thumb_tip.y < wrist.y :
-            return "Paper"
-
-        # Scissors: Index and middle fingers extended, others curled, and sufficient distance between them.
-        elif index_finger_extended and middle_finger_extended and not ring_finger_extended and not pinky_finger_extended and index_middle_dist > 0.08:
-             return "Scissors"
-
-        else:
-            return None  # Gesture not recognized
-
-    def stop(self):
-        self._run_flag = False
-        if self.cap and self.cap.isOpened():
-            self.cap.release()
-        self.wait()
-
-
-class RPSResultFrame(QFrame):
-    def __init__(self, player_choice, computer_choice, result_text):
-        super().__init__()
-        self.player_choice = player_choice
-        self.computer_choice = computer_choice
-        self.result_text = result_text
-        self.setFixedSize(200, 160)
-        self.setStyleSheet("""
-            QFrame {
-                border: 3px solid #008080;
-                border-radius: 15px;
-                background-color: rgba(0, 128, 128, 40);
-            }
-        """)
-        self.initUI()
-        self.hover_animation = QPropertyAnimation(self, b"geometry")
-        self.hover_animation.setDuration(200)
-        self.original_geometry = None
-
-    def initUI(self):
-        layout = QVBoxLayout()
-        player_image_path = f"{self.player_choice.lower()}.png" if self.player_choice else "question.png"
-        computer_image_path = f"{self.computer_choice.lower()}.png" if self.computer_choice else "question.png"
-        player_pixmap = QPixmap(player_image_path).scaled(60, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        computer_pixmap = QPixmap(computer_image_path).scaled(60, 60, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-
-        player_label = QLabel()
-        player_label.setPixmap(player_pixmap)
-        player_label.setAlignment(Qt.AlignCenter)
-
-        computer_label = QLabel()
-        computer_label.setPixmap(computer_pixmap)
-        computer_label.setAlignment(Qt.AlignCenter)
-
-        result_label = QLabel(self.result_text)
-        result_label.setAlignment(Qt.AlignCenter)
-        font = QFont("Segoe UI", 14, QFont.Bold)
-        result_label.setFont(font)
-
-        layout.addWidget(player_label)
-        layout.addWidget(computer_label)
-        layout.addWidget(result_label)
-        layout.setSpacing(8)
-        self.setLayout(layout)
-
-    def enterEvent(self, event):
-        if self.original_geometry is None:
-            self.original_geometry = self.geometry()
-        self.hover_animation.setStartValue(self.geometry())
-        self.hover_animation.setEndValue(self.original_geometry.adjusted(-5, -5, 5, 5))
-        self.hover_animation.start()
-
-    def leaveEvent(self, event):
-        self.hover_animation.setStartValue(self.geometry())
-        self.hover_animation.setEndValue(self.original_geometry)
-        self.hover_animation.start()
+class HistoryNotifier(QObject):
+    """Brings PlayerStore updates from its writer thread to the GUI thread."""
+    updated = pyqtSignal()
 
 
 class RockPaperScissorsGame(QWidget):
-    def __init__(self):
+    def __init__(self, source=None, realtime=True, roi_tracking=False, startup_timer=None,
+                 startup_report=None, max_attempts=5, two_players=False, player_assignment="side",
+                 inference_url=None, inference_timeout=0.25, show_metrics=False, metrics_log=None,
+                 record_path=None, record_jpeg_quality=80, replay_path=None, replay_session=None,
+                 opponent_strategy="random", history_path=None, backend="solutions",
+                 hand_model_path="hand_landmarker.task", show_landmarks=True):
         super().__init__()
+        self.source = source  # Camera index, video file, image directory or "synthetic"
+        self.realtime = realtime
+        self.roi_tracking = roi_tracking
+        self.startup_timer = startup_timer or StartupTimer()
+        self.startup_report = startup_report  # "-" prints to stderr, anything else is a JSON path
+        # Two players share one camera; player 2 takes the computer's place
+        self.two_players = two_players
+        self.player_assignment = player_assignment
+        # A GestureService doing inference for this kiosk; local inference covers its timeouts
+        self.inference_url = inference_url
+        self.inference_timeout = inference_timeout
+        self.show_metrics = show_metrics  # Overlay starts visible; F3 toggles it
+        self.metrics_logger = MetricsLogger(metrics_log) if metrics_log else None
+        self.metrics_overlay = None
+        self.video_label = None  # Built with the game screen
+        self.show_landmarks = show_landmarks  # Hand skeleton over the camera feed; F4 toggles it
+        self.record_path = record_path  # Session recording; created with the first tracking thread
+        self.record_jpeg_quality = record_jpeg_quality  # None stores raw frames
+        self.recorder = None
+        self.replay_path = replay_path  # Landmark dataset played back instead of the camera
+        self.replay_session = replay_session
+        # "solutions" runs mp.solutions.hands on the tracking thread; "tasks" the
+        # asynchronous Tasks hand landmarker with the model file at hand_model_path
+        self.backend = backend
+        self.hand_model_path = hand_model_path
+        self.player_title = "Игрок 1" if two_players else "Игрок"
+        self.opponent_name = "Игрок 2" if two_players else "Компьютер"
         self.setWindowTitle("Камень, Ножницы, Бумага")
         self.setMinimumSize(1200, 720)
         self.setWindowIcon(QIcon("icon.png"))
         self.player_name = ""
-        self.player_score = 0
-        self.computer_score = 0
-        self.attempts = 0
-        self.MAX_ATTEMPTS = 5
-        self.results = []
+        self.MAX_ATTEMPTS = max_attempts
+        self.game = GameState(max_attempts)  # Rules and scores; the widget only shows them
+        self.results = []  # (player choice, computer choice, result text) for the results screen
         self.player_choice = None
         self.computer_choice = None
-        self.choices = ["Rock", "Scissors", "Paper"]
+        self.opponent_strategy = opponent_strategy  # Name of an opponents.STRATEGIES entry
+        self.opponent = None  # Created once opponents.py has been imported in the background
+        self.history_path = history_path  # SQLite file with every match played, None to keep nothing
+        self.player_store = None
+        self.history_notifier = HistoryNotifier(self)
+        self.history_notifier.updated.connect(self.update_leaderboard)
         self.gesture_locked = False
-        self.round_winner = None
+        self.round_open = False  # Two-player mode: gestures are accepted after the countdown
+        self.pending_choices = {}  # Two-player mode: player index -> gesture shown this round
+        self.result_frame = (-1, 0.0)  # ID and capture time of the frame that decided the round
+        self.pixmap_cache = PixmapCache()
+        self.choice_pixmap_sizes = set()
 
         self.hand_tracking_thread = None
-        self.create_thread()
+        self.pipeline_ready = False
+        self.pipeline_failed = False  # Startup pipeline died before it was ready; start_game builds a new one
+        self.modules_failed = False  # Background import failed; the start button retries it
+        self.game_screen = None
+        self.results_screen = None
 
         self.countdown_timer = QTimer(self)
         self.countdown_timer.setInterval(1000)
@@ -244,28 +121,174 @@ class RockPaperScissorsGame(QWidget):
         self.delay_timer.timeout.connect(self.prepare_next_round)
         self.delay_timer.setSingleShot(True)
 
+        refresh_rate = QApplication.primaryScreen().refreshRate() or 60.0
+        self.display_interval = 1.0 / refresh_rate
+        self.last_frame_shown = 0.0
+        self.display_timer = QTimer(self)
+        self.display_timer.setSingleShot(True)
+        self.display_timer.timeout.connect(self.update_image)
+
         self.stacked_widget = QStackedWidget()
         self.main_layout = QVBoxLayout(self)  # Main layout for the whole window
         self.main_layout.addWidget(self.stacked_widget)
 
+        # Only the start screen is built up front; the rest is built while the player types a nickname
         self.init_start_screen()
-        self.init_game_screen()
-        self.init_results_screen()
-
         self.stacked_widget.addWidget(self.start_screen)
-        self.stacked_widget.addWidget(self.game_screen)
-        self.stacked_widget.addWidget(self.results_screen)
         self.stacked_widget.setCurrentWidget(self.start_screen)
 
         self.setStyleSheet(self.get_stylesheet())
+        QShortcut(QKeySequence(Qt.Key_F3), self, self.toggle_metrics_overlay)
+        QShortcut(QKeySequence(Qt.Key_F4), self, self.toggle_landmarks)
+
+        self.module_loader = ModuleLoader(["hand_tracking", "opponents", "player_store"])
+        self.module_loader.loaded.connect(self.on_modules_loaded)
+        self.module_loader.failed.connect(self.show_error)
+        self.module_loader.failed.connect(self.on_modules_failed)
+        QTimer.singleShot(0, self.start_background_loading)  # Runs once the window is on screen
+
+    def start_background_loading(self):
+        self.startup_timer.mark("window shown")
+        self.module_loader.start()
+
+    def on_modules_failed(self, message):
+        # Nothing can be played without the modules; offer to load them again
+        self.modules_failed = True
+        self.start_button.setText("Повторить загрузку")
+        self.check_nickname()
+
+    def on_start_clicked(self):
+        if self.modules_failed:
+            self.modules_failed = False
+            self.start_button.setText("Загрузка...")
+            self.check_nickname()
+            self.module_loader.start()
+        else:
+            self.start_game()
+
+    def on_modules_loaded(self):
+        self.startup_timer.mark("OpenCV and MediaPipe imported")
+        if not self.two_players:
+            from opponents import create_strategy
+            self.opponent = create_strategy(self.opponent_strategy)
+        if self.history_path:
+            from player_store import PlayerStore
+            self.player_store = PlayerStore(self.history_path, on_update=self.history_notifier.updated.emit)
+        # Load the model and open the camera on the tracking thread, then wait for the first game
+        self.create_thread()
+        self.hand_tracking_thread.pause()
+        self.hand_tracking_thread.start()
+
+        started = time.perf_counter()
+        self.init_game_screen()
+        self.init_results_screen()
+        self.stacked_widget.addWidget(self.game_screen)
+        self.stacked_widget.addWidget(self.results_screen)
+        self.startup_timer.add_duration("build game and results screens", time.perf_counter() - started)
+
+        started = time.perf_counter()
+        ratio = self.devicePixelRatioF()
+        self.pixmap_cache.preload(RoundResultDelegate.IMAGE_SIZE, RoundResultDelegate.IMAGE_SIZE, ratio)
+        self.startup_timer.add_duration("load choice images", time.perf_counter() - started)
+        self.startup_timer.mark("game and results screens built")
+
+    def on_pipeline_ready(self):
+        for name, seconds in self.hand_tracking_thread.init_timings.items():
+            self.startup_timer.add_duration(name, seconds)
+        if self.pipeline_ready:
+            return  # Pipeline was recreated after an error; startup is long over
+        self.startup_timer.mark("hand tracking ready")
+        self.pipeline_ready = True
+        self.start_button.setText("Играть!")
+        self.check_nickname()
+        if self.startup_report == "-":
+            self.startup_timer.print_report()
+        elif self.startup_report:
+            self.startup_timer.write_json(self.startup_report)
+
+    def on_pipeline_error(self, message):
+        if self.pipeline_ready:
+            return
+        # Camera or model failed to open at startup: let the player try anyway
+        self.pipeline_failed = True
+        self.start_button.setText("Играть!")
+        self.check_nickname()
 
     def create_thread(self):
+        # Only called at startup and after the pipeline died; games reuse the running thread
+        from frame_sources import create_frame_source
+        from hand_tracking import HandTrackingThread
+
         if self.hand_tracking_thread:
             self.hand_tracking_thread.stop()
-        self.hand_tracking_thread = HandTrackingThread()
+        if self.record_path and self.recorder is None:
+            from recorder import SessionRecorder
+            try:
+                self.recorder = SessionRecorder(self.record_path, jpeg_quality=self.record_jpeg_quality)
+            except OSError as e:
+                self.show_error(f"Запись сессии отключена: {e}")
+                self.record_path = None
+        players = 2 if self.two_players else 1
+        frame_source = create_frame_source(self.source, self.realtime)
+        inference_client = None
+        if self.replay_path:
+            from landmark_dataset import LandmarkDataset, LandmarkReplay
+            try:
+                dataset = LandmarkDataset(self.replay_path)
+            except (OSError, ValueError) as e:
+                self.show_error(f"Не удалось открыть запись, используется камера: {e}")
+                self.replay_path = None
+            else:
+                records = dataset.records if self.replay_session is None else dataset.session(self.replay_session)
+                inference_client = LandmarkReplay(records, realtime=self.realtime)
+                frame_source = inference_client.frame_source()
+        elif self.inference_url:
+            from gesture_service import RemoteInferenceClient
+            inference_client = RemoteInferenceClient(self.inference_url, timeout=self.inference_timeout,
+                                                     max_hands=players)
+        elif self.backend == "tasks":
+            from tasks_backend import LiveStreamHandLandmarker
+            inference_client = LiveStreamHandLandmarker(self.hand_model_path, max_hands=players)
+        self.hand_tracking_thread = HandTrackingThread(frame_source,
+                                                       roi_tracking=self.roi_tracking,
+                                                       players=players,
+                                                       player_assignment=self.player_assignment,
+                                                       inference_client=inference_client,
+                                                       recorder=self.recorder)
         self.hand_tracking_thread.image_data.connect(self.update_image)
-        self.hand_tracking_thread.gesture_detected.connect(self.handle_gesture)
+        if self.two_players:
+            self.hand_tracking_thread.player_gesture_detected.connect(self.handle_player_gesture)
+        else:
+            self.hand_tracking_thread.gesture_detected.connect(self.handle_gesture)
         self.hand_tracking_thread.error_signal.connect(self.show_error)
+        self.hand_tracking_thread.error_signal.connect(self.on_pipeline_error)
+        self.hand_tracking_thread.ready.connect(self.on_pipeline_ready)
+        self.hand_tracking_thread.metrics_updated.connect(self.on_metrics_updated)
+
+    def on_metrics_updated(self, snapshot):
+        if self.metrics_logger:
+            self.metrics_logger.write(snapshot)
+        if self.metrics_overlay and self.metrics_overlay.isVisible():
+            self.metrics_overlay.show_text(format_metrics(snapshot))
+
+    def toggle_metrics_overlay(self):
+        self.show_metrics = not self.show_metrics
+        if self.metrics_overlay:
+            self.metrics_overlay.setVisible(self.show_metrics)
+
+    def toggle_landmarks(self):
+        self.show_landmarks = not self.show_landmarks
+        if self.video_label:
+            self.video_label.set_landmarks_visible(self.show_landmarks)
+
+    def record_event(self, name, **data):
+        if self.recorder:
+            self.recorder.record_event(name, **data)
+
+    def set_tracking_mode(self, mode):
+        # Only run inference while a gesture can actually be accepted
+        if self.hand_tracking_thread:
+            self.hand_tracking_thread.scheduler.set_mode(mode)
 
     def init_start_screen(self):
         start_screen = QWidget()
@@ -281,7 +304,7 @@ class RockPaperScissorsGame(QWidget):
         self.animate_widget(title_label, duration=750, easing_curve=QEasingCurve.OutBounce)
         layout.addWidget(title_label)
 
-        subtitle_label = QLabel("против Компьютера")
+        subtitle_label = QLabel("для двух игроков" if self.two_players else "против Компьютера")
         subtitle_label.setFont(QFont("Arial", 28, QFont.Bold))
         subtitle_label.setAlignment(Qt.AlignCenter)
         subtitle_label.setStyleSheet("color: white; margin-bottom: 20px;")
@@ -323,7 +346,7 @@ class RockPaperScissorsGame(QWidget):
         nickname_layout.addWidget(self.nickname_input)
         layout.addWidget(nickname_frame, alignment=Qt.AlignCenter)
 
-        self.start_button = QPushButton("Играть!")
+        self.start_button = QPushButton("Загрузка...")  # Becomes "Играть!" once hand tracking is ready
         self.start_button.setFont(QFont("Arial", 28, QFont.Bold))
         self.start_button.setStyleSheet("""
             QPushButton {
@@ -350,7 +373,7 @@ class RockPaperScissorsGame(QWidget):
                 color: #999999;
             }
             """)
-        self.start_button.clicked.connect(self.start_game)
+        self.start_button.clicked.connect(self.on_start_clicked)
         self.start_button.setEnabled(False)
         self.add_shadow(self.start_button)
         layout.addWidget(self.start_button, alignment=Qt.AlignCenter)
@@ -376,7 +399,7 @@ class RockPaperScissorsGame(QWidget):
             "  - Камень ломает Ножницы<br>"
             "  - Ножницы режут Бумагу<br>"
             "  - Бумага накрывает Камень<br><br>"
-            "<i>Побеждает лучший из 5 раундов!</i>"
+            f"<i>Побеждает лучший из {self.MAX_ATTEMPTS} раундов!</i>"
         )
         rules_label = QLabel(rules_text)
         rules_label.setFont(QFont("Arial", 16))
@@ -392,12 +415,16 @@ class RockPaperScissorsGame(QWidget):
         start_screen.setLayout(layout)
 
     def check_nickname(self):
-        if self.nickname_input.text().strip():
+        if self.modules_failed:
+            self.start_button.setEnabled(True)  # Retrying the import needs no nickname
+        elif self.nickname_input.text().strip() and (self.pipeline_ready or self.pipeline_failed):
             self.start_button.setEnabled(True)
         else:
             self.start_button.setEnabled(False)
 
     def init_game_screen(self):
+        from display import MetricsOverlay, VideoWidget  # Already imported by ModuleLoader, see on_modules_loaded
+
         game_screen = QWidget()
         self.game_screen = game_screen
         game_screen.setAutoFillBackground(True)
@@ -421,7 +448,7 @@ class RockPaperScissorsGame(QWidget):
 
         # Player Section
         player_layout = QVBoxLayout()
-        self.player_label = QLabel(f"Игрок: {self.player_name}")  # Display player's name
+        self.player_label = QLabel(f"{self.player_title}: {self.player_name}")  # Display player's name
         self.player_label.setFont(QFont("Arial", 28, QFont.Bold))
         self.player_label.setAlignment(Qt.AlignCenter)
         self.player_label.setStyleSheet("color: #AAAAAA;")  # Light gray
@@ -432,7 +459,7 @@ class RockPaperScissorsGame(QWidget):
         self.player_choice_label.setMinimumSize(120, 120)  # Ensure it's large enough
         player_layout.addWidget(self.player_choice_label)
 
-        self.video_label = QLabel()  # Displays the camera feed
+        self.video_label = VideoWidget()  # Displays the camera feed
         self.video_label.setFixedSize(480, 360)
         self.video_label.setStyleSheet("""
                 border: 3px solid;
@@ -440,6 +467,9 @@ class RockPaperScissorsGame(QWidget):
                                     stop: 0 #006666, stop: 1 #008080);
                 border-radius: 15px;
                 """)  # Rounded border with gradient
+        self.video_label.set_landmarks_visible(self.show_landmarks)
+        self.metrics_overlay = MetricsOverlay(self.video_label)
+        self.metrics_overlay.setVisible(self.show_metrics)
         player_layout.addWidget(self.video_label)
         player_layout.setAlignment(Qt.AlignCenter)
 
@@ -455,7 +485,7 @@ class RockPaperScissorsGame(QWidget):
 
         # Computer Section
         computer_layout = QVBoxLayout()
-        computer_label = QLabel("Компьютер")
+        computer_label = QLabel(self.opponent_name)
         computer_label.setFont(QFont("Arial", 28, QFont.Bold))
         computer_label.setAlignment(Qt.AlignCenter)
         computer_label.setStyleSheet("color: #AAAAAA;")  # Light gray
@@ -492,13 +522,13 @@ class RockPaperScissorsGame(QWidget):
         # Bottom Layout (Score, Attempts, Result, Countdown)
         bottom_layout = QVBoxLayout()
 
-        self.score_label = QLabel("Игрок: 0   Компьютер: 0")  # Score display
+        self.score_label = QLabel(f"{self.player_title}: 0   {self.opponent_name}: 0")  # Score display
         self.score_label.setFont(QFont("Arial", 22, QFont.Bold))
         self.score_label.setAlignment(Qt.AlignCenter)
         self.score_label.setStyleSheet("color: white;")
         bottom_layout.addWidget(self.score_label)
 
-        self.attempts_label = QLabel("Раунд: 1/5")  # Attempts display
+        self.attempts_label = QLabel(f"Раунд: 1/{self.MAX_ATTEMPTS}")  # Attempts display
         self.attempts_label.setFont(QFont("Arial", 18, QFont.Bold))
         self.attempts_label.setAlignment(Qt.AlignCenter)
         self.attempts_label.setStyleSheet("color: white;")
@@ -520,39 +550,6 @@ class RockPaperScissorsGame(QWidget):
         main_layout.addLayout(bottom_layout)
         game_screen.setLayout(main_layout)
 
-    def init_results_screen(self):
-        results_screen = QWidget()
-        self.results_screen = results_screen
-        layout = QVBoxLayout()
-
-        # Title
-        title_label = QLabel("Результаты")
-        title_label.setFont(QFont("Impact", 48, QFont.Bold))
-        title_label.setAlignment(Qt.AlignCenter)
-        title_label.setStyleSheet("color: #008080;")
-        layout.addWidget(title_label)
-
-        # Container for round results
-        self.rounds_results_container = QHBoxLayout()
-        layout.addLayout(self.rounds_results_container)
-
-        # Final Result Label
-        self.final_result_label = QLabel()
-        final_font = QFont("Arial", 36, QFont.Bold)  # Larger, bold font
-        self.final_result_label.setFont(final_font)
-        self.final_result_label.setAlignment(Qt.AlignCenter)
-        self.final_result_label.setStyleSheet("color: white")
-        layout.addWidget(self.final_result_label)
-
-        # Restart Button
-        restart_button = QPushButton("Переиграть")
-        restart_button.setFont(QFont("Arial", 18, QFont.Bold))
-        restart_button.clicked.connect(self.restart_game)
-        self.add_shadow(restart_button)  # Add shadow for depth
-        layout.addWidget(restart_button)
-
-        results_screen.setLayout(layout)
-
     def init_results_screen(self):
         results_screen = QWidget()
         self.results_screen = results_screen
@@ -565,12 +562,9 @@ class RockPaperScissorsGame(QWidget):
         title_label.setStyleSheet("color: #008080; margin-bottom: 10px;")
         layout.addWidget(title_label)
 
-        self.rounds_results_container = QHBoxLayout()
-
-        scroll_area = QFrame()
-        scroll_area.setLayout(self.rounds_results_container)
-        scroll_area.setStyleSheet("background-color: transparent;")
-        layout.addWidget(scroll_area)
+        # Only the rounds that are on screen get painted, so long matches open as fast as short ones
+        self.rounds_results_view = RoundResultsView(self.pixmap_cache)
+        layout.addWidget(self.rounds_results_view, stretch=1)
 
         self.final_result_label = QLabel()
         final_font = QFont("Arial", 36, QFont.Bold)
@@ -585,6 +579,12 @@ class RockPaperScissorsGame(QWidget):
             """)
         layout.addWidget(self.final_result_label)
 
+        self.leaderboard_label = QLabel()  # Filled from PlayerStore's precomputed queries
+        self.leaderboard_label.setFont(QFont("Arial", 16))
+        self.leaderboard_label.setAlignment(Qt.AlignCenter)
+        self.leaderboard_label.setStyleSheet("color: #AAAAAA;")
+        layout.addWidget(self.leaderboard_label)
+
         restart_button = QPushButton("Переиграть")
         restart_button.setFont(QFont("Arial", 20, QFont.Bold))
         restart_button.setStyleSheet("""
@@ -641,17 +641,29 @@ class RockPaperScissorsGame(QWidget):
 
     def start_game(self):
         self.player_name = self.nickname_input.text().strip()
-        self.player_label.setText(f"Игрок: {self.player_name}")
+        self.player_label.setText(f"{self.player_title}: {self.player_name}")
         self.stacked_widget.setCurrentWidget(self.game_screen)
         self.reset_game_state()
-        if not self.hand_tracking_thread.isRunning():
+        if self.pipeline_failed or self.hand_tracking_thread.isFinished():
+            self.pipeline_failed = False
+            self.create_thread()  # Camera error or end of a recording
+        contents = self.video_label.contentsRect()
+        self.hand_tracking_thread.set_display_size(contents.width(), contents.height())
+        if self.hand_tracking_thread.isRunning():
+            self.hand_tracking_thread.resume()
+        else:
             self.hand_tracking_thread.start()
+        self.record_event("match_start", player=self.player_name, rounds=self.MAX_ATTEMPTS,
+                          two_players=self.two_players)
         self.start_countdown()
 
     def start_countdown(self):
         self.countdown_number = 3
         self.countdown_label.setText(str(self.countdown_number))
+        self.set_tracking_mode(InferenceScheduler.PREVIEW)
+        self.record_event("round_start", round=self.game.round_number)
         self.countdown_timer.start()
+        QTimer.singleShot(0, self.preload_choice_pixmaps)  # After the game screen has been laid out
 
     def update_countdown(self):
         self.countdown_number -= 1
@@ -660,36 +672,59 @@ class RockPaperScissorsGame(QWidget):
         else:
             self.countdown_label.setText("")
             self.countdown_timer.stop()
-            self.computer_choice = random.choice(self.choices)
-
-    def handle_gesture(self, gesture, x, y):
+            if self.two_players:
+                self.round_open = True
+            else:
+                # Worked out when the previous round ended, so this is just a lookup
+                self.computer_choice = self.opponent.next_gesture()
+            self.set_tracking_mode(InferenceScheduler.FULL)
+            self.record_event("round_open", computer_choice=self.computer_choice)
+
+    def handle_gesture(self, gesture, x, y, frame_id=-1, captured_at=0.0):
         if self.countdown_timer.isActive() or self.gesture_locked:
             return
 
         if self.computer_choice is not None:
+            started = time.perf_counter()
             self.gesture_locked = True
+            self.set_tracking_mode(InferenceScheduler.PREVIEW)
             self.player_choice = gesture
-            print(f"Detected gesture: {gesture}, x: {x}, y: {y}")
+            self.result_frame = (frame_id, captured_at)
+            tracer.complete("handle_gesture", started, frame_id=frame_id, flow="t", flow_name="result")
+            self.determine_winner()
             self.display_player_choice()
             self.display_computer_choice()
-            self.determine_winner()
             self.delay_timer.start()
 
-    def prepare_next_round(self):
-        if self.round_winner == "player":
-            self.player_score += 1
-        elif self.round_winner == "computer":
-            self.computer_score += 1
+    def handle_player_gesture(self, player, gesture, x, y, frame_id=-1, captured_at=0.0):
+        # Two-player mode: the round resolves once both players have shown a gesture
+        if self.countdown_timer.isActive() or self.gesture_locked or not self.round_open:
+            return
 
+        started = time.perf_counter()
+        self.pending_choices[player] = gesture
+        if len(self.pending_choices) < 2:
+            return
+        self.result_frame = (frame_id, captured_at)  # The second gesture decides the round
+        tracer.complete("handle_gesture", started, frame_id=frame_id, flow="t", flow_name="result")
+        self.gesture_locked = True
+        self.set_tracking_mode(InferenceScheduler.PREVIEW)
+        self.player_choice = self.pending_choices[0]
+        self.computer_choice = self.pending_choices[1]
+        self.determine_winner()
+        self.display_player_choice()
+        self.display_computer_choice()
+        self.delay_timer.start()
+
+    def prepare_next_round(self):
+        # The round was scored in determine_winner; the score board catches up once the result was shown
         self.update_score()
-        self.round_winner = None
 
-        if self.attempts >= self.MAX_ATTEMPTS - 1:
+        if self.game.finished:
             self.show_results()
         else:
-            self.attempts += 1
             self.attempts_label.setText(
-                f"Раунд: {self.attempts + 1}/{self.MAX_ATTEMPTS}")
+                f"Раунд: {self.game.round_number}/{self.MAX_ATTEMPTS}")
             self.result_label.setText("")
             self.player_choice_label.clear()
             self.computer_choice_label.clear()
@@ -697,41 +732,62 @@ class RockPaperScissorsGame(QWidget):
             self.player_choice = None
             self.computer_choice = None
             self.gesture_locked = False
+            self.round_open = False
+            self.pending_choices = {}
             self.start_countdown()
 
     def determine_winner(self):
-        if self.player_choice == self.computer_choice:
-            result_text = "Ничья!"
-            self.round_winner = "tie"
-        elif (self.player_choice == "Rock" and self.computer_choice == "Scissors") or \
-             (self.player_choice == "Scissors" and self.computer_choice == "Paper") or \
-             (self.player_choice == "Paper" and self.computer_choice == "Rock"):
-            result_text = "Игрок побеждает!"
-            self.round_winner = "player"
+        started = time.perf_counter()
+        winner = self.game.play_round(self.player_choice, self.computer_choice)
+        if winner == PLAYER:
+            result_text = f"{self.player_title} побеждает!"
+        elif winner == OPPONENT:
+            result_text = f"{self.opponent_name} побеждает!"
         else:
-            result_text = "Компьютер побеждает!"
-            self.round_winner = "computer"
+            result_text = "Ничья!"
 
         self.result_label.setText(result_text)
         self.animate_result()
         self.results.append((self.player_choice, self.computer_choice, result_text))
+        if self.opponent:
+            self.opponent.observe_gestures(self.player_choice, self.computer_choice)
+        self.record_event("round_result", player_choice=self.player_choice, opponent_choice=self.computer_choice,
+                          winner=winner, frame=self.result_frame[0])
+        tracer.complete("determine_winner", started, frame_id=self.result_frame[0], flow="t", flow_name="result")
 
     def update_score(self):
-        self.score_label.setText(f"Игрок: {self.player_score}   Компьютер: {self.computer_score}")
+        self.score_label.setText(f"{self.player_title}: {self.game.player_score}   "
+                                 f"{self.opponent_name}: {self.game.opponent_score}")
+
+    def preload_choice_pixmaps(self):
+        # Scale the choice images for the current label sizes before a round can resolve
+        sizes = {(label.width(), label.height()) for label in (self.player_choice_label, self.computer_choice_label)}
+        if sizes == self.choice_pixmap_sizes:
+            return
+        for size in self.choice_pixmap_sizes - sizes:
+            if size != (RoundResultDelegate.IMAGE_SIZE, RoundResultDelegate.IMAGE_SIZE):
+                self.pixmap_cache.discard_size(*size)  # Window was resized
+        self.choice_pixmap_sizes = sizes
+        for size in sizes:
+            self.pixmap_cache.preload(*size, self.devicePixelRatioF())
 
     def display_player_choice(self):
         if self.player_choice:
-            pixmap = QPixmap(f"{self.player_choice.lower()}.png")
-            pixmap = pixmap.scaled(self.player_choice_label.width(), self.player_choice_label.height(), Qt.KeepAspectRatio)
+            started = time.perf_counter()
+            pixmap = self.pixmap_cache.get(self.player_choice, self.player_choice_label.width(),
+                                           self.player_choice_label.height(), self.devicePixelRatioF())
             self.player_choice_label.setPixmap(pixmap)
+            # The player sees their choice: end of the motion-to-result path
+            frame_id, captured_at = self.result_frame
+            tracer.complete("setPixmap", started, frame_id=frame_id, flow="f", flow_name="result",
+                            motion_to_result_ms=round((time.perf_counter() - captured_at) * 1000, 2))
         else:
             self.player_choice_label.clear()
 
     def display_computer_choice(self):
         if self.computer_choice:
-            pixmap = QPixmap(f"{self.computer_choice.lower()}.png")
-            pixmap = pixmap.scaled(self.computer_choice_label.width(), self.computer_choice_label.height(),
-                                   Qt.KeepAspectRatio)
+            pixmap = self.pixmap_cache.get(self.computer_choice, self.computer_choice_label.width(),
+                                           self.computer_choice_label.height(), self.devicePixelRatioF())
             self.computer_choice_label.setPixmap(pixmap)
             self.computer_choice_text_label.setText(
                 self.computer_choice)
@@ -740,57 +796,77 @@ class RockPaperScissorsGame(QWidget):
             self.computer_choice_text_label.clear()
 
     def show_results(self):
+        self.set_tracking_mode(InferenceScheduler.PAUSED)
+        self.record_event("match_end", player_score=self.game.player_score, opponent_score=self.game.opponent_score)
         self.stacked_widget.setCurrentWidget(self.results_screen)
-        for i in reversed(range(self.rounds_results_container.count())):
-            widget = self.rounds_results_container.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-                widget.deleteLater()
+        self.rounds_results_view.set_results(self.results)
 
-        for player_choice, computer_choice, result_text in self.results:
-            frame = RPSResultFrame(player_choice, computer_choice, result_text)
-            self.rounds_results_container.addWidget(frame)
-
-        if self.player_score > self.computer_score:
+        match_winner = self.game.match_winner()
+        if match_winner == PLAYER:
             self.final_result_label.setText(
                 f"{self.player_name} побеждает в игре!")
-        elif self.computer_score > self.player_score:
-            self.final_result_label.setText("Компьютер побеждает в игре!")
+        elif match_winner == OPPONENT:
+            self.final_result_label.setText(f"{self.opponent_name} побеждает в игре!")
         else:
             self.final_result_label.setText(
                 "В игре ничья!")
 
+        if self.player_store:
+            # Only queued here; the leaderboard follows once the writer thread has saved it
+            self.player_store.record_match(self.player_name, self.opponent_name, self.game.rounds,
+                                           self.game.player_score, self.game.opponent_score, match_winner)
+        self.update_leaderboard()
+
+    def update_leaderboard(self):
+        if not self.player_store or not self.results_screen:
+            return
+        lines = []
+        if self.player_store.top_players:
+            lines.append("Лучшие игроки:")
+            for place, (name, wins, matches, win_rate) in enumerate(self.player_store.top_players, 1):
+                lines.append(f"{place}. {name} — побед: {wins} из {matches} ({win_rate:.0%})")
+        stats = self.player_store.stats_for(self.player_name)
+        if stats:
+            lines.append(f"{self.player_name}: побед {stats['wins']} из {stats['matches']} ({stats['win_rate']:.0%})")
+        self.leaderboard_label.setText("\n".join(lines))
+
     def reset_game_state(self):
-        self.player_score = 0
-        self.computer_score = 0
-        self.attempts = 0
+        if self.opponent:
+            self.opponent.reset()  # A new player: forget the last one's habits
+        self.game.reset()
         self.results = []
         self.player_choice = None
         self.computer_choice = None
         self.gesture_locked = False
-        self.round_winner = None
+        self.round_open = False
+        self.pending_choices = {}
 
         self.update_score()
-        self.attempts_label.setText("Раунд: 1/5")
+        self.attempts_label.setText(f"Раунд: 1/{self.MAX_ATTEMPTS}")
         self.result_label.setText("")
 
     def restart_game(self):
         self.reset_game_state()
-        self.create_thread()
+        self.hand_tracking_thread.pause()
+        self.hand_tracking_thread.reset()
+        self.video_label.clear_frame()
         self.stacked_widget.setCurrentWidget(self.start_screen)
-
-        for i in reversed(range(self.rounds_results_container.count())):
-            layout_item = self.rounds_results_container.itemAt(i)
-            if layout_item:
-                widget = layout_item.widget()
-                if widget:
-                    widget.setParent(None)
-                    widget.deleteLater()
-
-    def update_image(self, q_img):
-        pixmap = QPixmap.fromImage(q_img)
-        pixmap = pixmap.scaled(self.video_label.width(), self.video_label.height(), Qt.KeepAspectRatio)
-        self.video_label.setPixmap(pixmap)
+        self.rounds_results_view.set_results([])
+
+    def update_image(self):
+        # Take at most one frame per display refresh; the newest one replaces the rest meanwhile
+        delay = self.last_frame_shown + self.display_interval - time.perf_counter()
+        if delay > 0:
+            if not self.display_timer.isActive():
+                self.display_timer.start(int(delay * 1000) + 1)
+            return
+        started = time.perf_counter()
+        display_frame = self.hand_tracking_thread.display_mailbox.take()
+        if display_frame is not None:
+            tracer.complete("update_image", started, frame_id=display_frame.frame_id, flow="t")
+            self.last_frame_shown = time.perf_counter()
+            # The frame already has the label's size, so this is just a blit
+            self.video_label.set_frame(display_frame)
 
     def show_error(self, message):
         msg_box = QMessageBox()
@@ -820,10 +896,18 @@ class RockPaperScissorsGame(QWidget):
         msg_box.exec_()
 
     def closeEvent(self, event):
+        self.module_loader.wait()
         if self.hand_tracking_thread:
             self.hand_tracking_thread.stop()
         self.countdown_timer.stop()
         self.delay_timer.stop()
+        if self.metrics_logger:
+            self.metrics_logger.close()
+        if self.player_store:
+            self.player_store.close()
+        if self.recorder:
+            self.recorder.close()  # After the tracking thread has stopped adding to it
+        tracer.save()
         event.accept()
 
     def get_stylesheet(self):
@@ -870,8 +954,72 @@ class RockPaperScissorsGame(QWidget):
                         """
 
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Камень, Ножницы, Бумага")
+    parser.add_argument("--source", default="0",
+                        help="camera index, video file, image directory or 'synthetic'")
+    parser.add_argument("--fast", action="store_true",
+                        help="replay recorded sources as fast as possible instead of at native FPS")
+    parser.add_argument("--roi", action="store_true",
+                        help="run hand inference on a crop around the last known hand "
+                             "(solutions backend only; not with --replay)")
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="number of rounds in a match")
+    parser.add_argument("--two-players", action="store_true",
+                        help="two players in front of one camera instead of playing the computer")
+    parser.add_argument("--assign", choices=("side", "handedness"), default="side",
+                        help="two-player mode: tell players apart by screen side or by hand")
+    parser.add_argument("--inference-url", metavar="URL",
+                        help="run hand inference on a gesture service (see gesture_service.py)")
+    parser.add_argument("--inference-timeout", type=float, default=0.25,
+                        help="seconds to wait for the service before falling back to local inference")
+    parser.add_argument("--backend", choices=("solutions", "tasks"), default="solutions",
+                        help="hand tracking backend: MediaPipe solutions, or the Tasks API in live-stream mode")
+    parser.add_argument("--hand-model", default="hand_landmarker.task", metavar="PATH",
+                        help="hand landmarker model file for --backend tasks")
+    parser.add_argument("--no-landmarks", action="store_true",
+                        help="start with the hand skeleton overlay hidden (F4 toggles it)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="show the pipeline metrics overlay from the start (F3 toggles it)")
+    parser.add_argument("--metrics-log", metavar="PATH",
+                        help="append a pipeline metrics snapshot per second to a JSON lines file")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record frames, landmarks, gestures and game events to PATH")
+    parser.add_argument("--record-raw", action="store_true",
+                        help="store recorded frames uncompressed instead of as JPEG")
+    parser.add_argument("--replay", metavar="DATASET",
+                        help="play a landmark dataset (see landmark_dataset.py) instead of the camera")
+    parser.add_argument("--replay-session", type=int, default=None,
+                        help="only replay this session of the dataset")
+    parser.add_argument("--opponent", choices=("random", "frequency", "markov", "mixture"), default="random",
+                        help="how the computer picks its moves (see opponents.py)")
+    parser.add_argument("--history", default="history.db", metavar="PATH",
+                        help="SQLite file that keeps every match for the leaderboard")
+    parser.add_argument("--no-history", action="store_true",
+                        help="don't keep match history")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write a Chrome trace of every frame to PATH (or set RPS_TRACE)")
+    parser.add_argument("--startup-report", nargs="?", const="-", metavar="PATH",
+                        help="print startup timings, or write them as JSON to PATH")
+    args, _ = parser.parse_known_args(argv)
+    if args.replay and not os.path.isfile(args.replay):
+        parser.error(f"--replay: no such dataset: {args.replay}")
+    if args.record and not os.path.isdir(os.path.dirname(os.path.abspath(args.record))):
+        parser.error(f"--record: directory does not exist: {os.path.dirname(os.path.abspath(args.record))}")
+    if args.roi and (args.backend == "tasks" or args.replay):
+        # Those clients never run the local model, which is what --roi crops for
+        parser.error("--roi only works with the solutions backend and without --replay")
+    return args
+
+
 if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    if args.trace:
+        tracer.start(args.trace)
+    startup_timer = StartupTimer(STARTUP_ORIGIN)
+    startup_timer.mark("Qt imported")
     app = QApplication(sys.argv)
+    startup_timer.mark("QApplication created")
     app.setStyleSheet("""
             QMessageBox {
                 background-color: #333333;
@@ -892,7 +1040,19 @@ if __name__ == "__main__":
                 }
             """)
     try:
-        game = RockPaperScissorsGame()
+        game = RockPaperScissorsGame(source=args.source, realtime=not args.fast, roi_tracking=args.roi,
+                                     startup_timer=startup_timer, startup_report=args.startup_report,
+                                     max_attempts=args.rounds, two_players=args.two_players,
+                                     player_assignment=args.assign, inference_url=args.inference_url,
+                                     inference_timeout=args.inference_timeout, show_metrics=args.metrics,
+                                     metrics_log=args.metrics_log, record_path=args.record,
+                                     record_jpeg_quality=None if args.record_raw else 80,
+                                     replay_path=args.replay, replay_session=args.replay_session,
+                                     opponent_strategy=args.opponent,
+                                     history_path=None if args.no_history else args.history,
+                                     backend=args.backend, hand_model_path=args.hand_model,
+                                     show_landmarks=not args.no_landmarks)
+        startup_timer.mark("start screen built")
         game.showFullScreen()
         sys.exit(app.exec_())
     except Exception as main_error:
@@ -0,0 +1,47 @@
+import json
+import sys
+import threading
+import time
+
+
+class StartupTimer:
+    """Collects named startup milestones (time since `origin`) and durations of individual steps."""
+
+    def __init__(self, origin=None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self._lock = threading.Lock()  # Marks come from the GUI, loader and tracking threads
+        self.marks = []
+        self.durations = {}
+
+    def mark(self, name):
+        elapsed = time.perf_counter() - self.origin
+        with self._lock:
+            self.marks.append((name, elapsed))
+        return elapsed
+
+    def add_duration(self, name, seconds):
+        with self._lock:
+            self.durations[name] = seconds
+
+    def report(self):
+        with self._lock:
+            marks = sorted(self.marks, key=lambda mark: mark[1])
+            durations = dict(self.durations)
+        return {
+            "milestones_ms": {name: round(elapsed * 1000, 1) for name, elapsed in marks},
+            "steps_ms": {name: round(seconds * 1000, 1) for name, seconds in durations.items()},
+        }
+
+    def print_report(self, file=sys.stderr):
+        report = self.report()
+        print("Startup timing (ms since launch):", file=file)
+        for name, elapsed in report["milestones_ms"].items():
+            print(f"  {elapsed:9.1f}  {name}", file=file)
+        if report["steps_ms"]:
+            print("Startup steps (ms):", file=file)
+            for name, duration in report["steps_ms"].items():
+                print(f"  {duration:9.1f}  {name}", file=file)
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
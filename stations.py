@@ -0,0 +1,358 @@
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from frame_sources import create_frame_source
+from game_core import CHOICES, GameState
+from gestures import classify_gesture, landmarks_to_array
+from smoothing import GestureSmoother
+
+
+class HeadlessSession:
+    """The RockPaperScissorsGame round flow driven by a clock instead of QTimers.
+
+    countdown -> waiting for a gesture -> showing the result -> next round,
+    and a new match starts as soon as one is finished.
+    """
+
+    COUNTDOWN_SECONDS = 3.0
+    RESULT_SECONDS = 2.2
+
+    def __init__(self, max_attempts=5, rng=None):
+        self.game = GameState(max_attempts)
+        self.rng = rng or random.Random()
+        self.matches = []  # (player_score, computer_score) of every finished match
+        self.rounds_played = 0
+        self.round_generation = 0  # Bumped whenever a round starts accepting gestures
+        self.phase_ends = None
+        self.start_match()
+
+    def start_match(self):
+        self.game.reset()
+        self.start_round()
+
+    def start_round(self):
+        self.phase = "countdown"
+        self.computer_choice = None
+        if self.phase_ends is not None:
+            self.phase_ends += self.COUNTDOWN_SECONDS
+
+    def tick(self, now):
+        """Advances the round flow; returns True while a gesture would be accepted."""
+        if self.phase_ends is None:
+            self.phase_ends = now + self.COUNTDOWN_SECONDS
+        if now < self.phase_ends:
+            return self.phase == "waiting"
+
+        if self.phase == "countdown":
+            self.phase = "waiting"
+            self.computer_choice = self.rng.choice(CHOICES)
+            self.round_generation += 1
+            self.phase_ends = float("inf")  # Until a gesture arrives
+        elif self.phase == "result":
+            self.phase_ends = now
+            if self.game.finished:
+                self.matches.append((self.game.player_score, self.game.opponent_score))
+                self.start_match()
+            else:
+                self.start_round()
+        return self.phase == "waiting"
+
+    def on_gesture(self, gesture, now):
+        if self.phase != "waiting":
+            return
+        self.game.play_round(gesture, self.computer_choice)
+        self.rounds_played += 1
+        self.phase = "result"
+        self.phase_ends = now + self.RESULT_SECONDS
+
+
+def inference_worker(task_queue, result_queues, station_ids, ready_queue):
+    """Runs in a worker process: one warm Hands model per station pinned to this worker.
+
+    Stations are pinned because MediaPipe's video mode tracks the hand from
+    frame to frame, so one station's frames must always hit the same model.
+    Reports (pid, error) on ready_queue once the models are loaded or failed
+    to, and answers every task with (hands, error) so no station waits forever.
+    """
+    try:
+        import mediapipe as mp
+
+        models = {
+            station_id: mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1,
+                                                 min_detection_confidence=0.7, min_tracking_confidence=0.7)
+            for station_id in station_ids
+        }
+    except Exception as e:
+        ready_queue.put((os.getpid(), f"Could not load the hand model: {e}"))
+        return
+    buffers = {}  # station_id -> that station's current SharedMemory
+    ready_queue.put((os.getpid(), None))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        station_id, buffer_name, shape = task
+        try:
+            buffer = buffers.get(station_id)
+            if buffer is None or buffer.name != buffer_name:
+                # The station grew its buffer and unlinked the old one; drop our mapping of it too
+                if buffer is not None:
+                    buffer.close()
+                buffer = buffers[station_id] = shared_memory.SharedMemory(name=buffer_name)
+            rgb_frame = np.ndarray(shape, dtype=np.uint8, buffer=buffer.buf)
+            results = models[station_id].process(rgb_frame)
+
+            hands = []
+            for index, hand_landmarks in enumerate(results.multi_hand_landmarks or ()):
+                score = results.multi_handedness[index].classification[0].score
+                hands.append((landmarks_to_array(hand_landmarks), score))
+            result_queues[station_id].put((hands, None))
+        except Exception as e:
+            result_queues[station_id].put(([], f"Inference failed: {e}"))
+
+    for model in models.values():
+        model.close()
+    for buffer in buffers.values():
+        buffer.close()
+
+
+class Station(threading.Thread):
+    """Feeds one frame source through its session, sending frames to its pinned inference worker."""
+
+    RESULT_POLL_SECONDS = 0.5  # How often a station waiting for a result checks that it still can get one
+
+    def __init__(self, station_id, source, task_queue, result_queue, session):
+        super().__init__(name=f"station-{station_id}", daemon=True)
+        self.station_id = station_id
+        self.source = source
+        self.task_queue = task_queue
+        self.result_queue = result_queue
+        self.session = session
+        self.smoother = GestureSmoother()
+        self.frame_buffer = None  # Shared memory the worker reads RGB frames from
+        self.worker = None  # Process answering this station, set by StationManager
+        self.frames_captured = 0
+        self.frames_inferred = 0
+        self.error = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            if not self.source.open():
+                self.error = "Could not open frame source"
+                return
+            round_generation = self.session.round_generation
+            while not self._stop_event.is_set():
+                ret, frame = self.source.read()
+                if not ret:
+                    if not self.source.end_of_stream:
+                        self.error = "Error reading frame."
+                    break
+                self.frames_captured += 1
+                now = time.perf_counter()
+                if not self.session.tick(now):
+                    continue  # Countdown or result on screen: nobody needs inference now
+                if self.session.round_generation != round_generation:
+                    round_generation = self.session.round_generation
+                    self.smoother.reset()
+
+                frame = cv2.flip(frame, 1)
+                if self.frame_buffer is None or self.frame_buffer.size < frame.nbytes:
+                    self.release_buffer()
+                    self.frame_buffer = shared_memory.SharedMemory(create=True, size=frame.nbytes)
+                rgb_frame = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.frame_buffer.buf)
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+                self.task_queue.put((self.station_id, self.frame_buffer.name, frame.shape))
+                reply = self.wait_for_result()
+                if reply is None:
+                    break
+                hands, error = reply
+                if error:
+                    self.error = error  # Reported in stats; the frame counts as one without a hand
+                self.frames_inferred += 1
+
+                if hands:
+                    points, confidence = hands[0]
+                    stable_gesture = self.smoother.update(classify_gesture(points), confidence, now)
+                    if stable_gesture:
+                        self.session.on_gesture(stable_gesture, now)
+                else:
+                    self.smoother.update(None, 1.0, now)
+        except Exception as e:
+            self.error = f"Error in station {self.station_id}: {str(e)}"
+        finally:
+            self.source.release()
+
+    def wait_for_result(self):
+        """The worker's (hands, error) reply, or None when stopping or the worker has died."""
+        while True:
+            try:
+                return self.result_queue.get(timeout=self.RESULT_POLL_SECONDS)
+            except queue.Empty:
+                if self._stop_event.is_set():
+                    return None
+                if self.worker is not None and not self.worker.is_alive():
+                    self.error = f"Inference worker {self.worker.name} exited with code {self.worker.exitcode}"
+                    return None
+
+    def release_buffer(self):
+        if self.frame_buffer is not None:
+            self.frame_buffer.close()
+            self.frame_buffer.unlink()
+            self.frame_buffer = None
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class StationManager:
+    """Runs N headless game sessions against N frame sources on a pool of inference worker processes."""
+
+    def __init__(self, sources, workers=None, max_attempts=5, ready_timeout=120.0):
+        self.context = multiprocessing.get_context("spawn")
+        self.worker_count = max(1, min(workers or os.cpu_count() or 1, len(sources)))
+        self.task_queues = [self.context.Queue() for _ in range(self.worker_count)]
+        self.result_queues = [self.context.Queue() for _ in sources]
+        self.ready_queue = self.context.Queue()
+        self.ready_timeout = ready_timeout  # Longest wait for the workers to load their models
+        self.stations = [
+            Station(station_id, source, self.task_queues[station_id % self.worker_count],
+                    self.result_queues[station_id], HeadlessSession(max_attempts))
+            for station_id, source in enumerate(sources)
+        ]
+        self.workers = []
+        self._last_counts = None
+
+    def start(self):
+        for index, task_queue in enumerate(self.task_queues):
+            station_ids = [station.station_id for station in self.stations if station.station_id % self.worker_count == index]
+            worker = self.context.Process(target=inference_worker, name=f"inference-{index}", daemon=True,
+                                          args=(task_queue, self.result_queues, station_ids, self.ready_queue))
+            worker.start()
+            self.workers.append(worker)
+        error = self.wait_for_workers()  # Every model is loaded before the first frame is read
+        if error:
+            self.stop_workers()
+            raise RuntimeError(error)
+        for station in self.stations:
+            station.worker = self.workers[station.station_id % self.worker_count]
+        self._last_counts = (time.perf_counter(), self.counts())
+        for station in self.stations:
+            station.start()
+
+    def wait_for_workers(self):
+        """None once every worker has reported ready, otherwise what went wrong."""
+        deadline = time.monotonic() + self.ready_timeout
+        waiting = len(self.workers)
+        while waiting:
+            try:
+                _, error = self.ready_queue.get(timeout=0.5)
+            except queue.Empty:
+                dead = [worker.name for worker in self.workers if not worker.is_alive()]
+                if dead:
+                    return f"Inference workers exited during startup: {', '.join(dead)}"
+                if time.monotonic() > deadline:
+                    return f"Inference workers not ready after {self.ready_timeout:.0f} s"
+                continue
+            if error:
+                return error
+            waiting -= 1
+        return None
+
+    def counts(self):
+        return [(station.frames_captured, station.frames_inferred) for station in self.stations]
+
+    def stats(self):
+        """Per-station FPS since the previous call, plus totals."""
+        now = time.perf_counter()
+        counts = self.counts()
+        last_time, last_counts = self._last_counts
+        elapsed = max(now - last_time, 1e-9)
+        self._last_counts = (now, counts)
+        return [
+            {
+                "station": station.station_id,
+                "capture_fps": (captured - last_captured) / elapsed,
+                "inference_fps": (inferred - last_inferred) / elapsed,
+                "rounds": station.session.rounds_played,
+                "matches": len(station.session.matches),
+                "alive": station.is_alive(),
+                "error": station.error,
+            }
+            for station, (captured, inferred), (last_captured, last_inferred) in zip(self.stations, counts, last_counts)
+        ]
+
+    def running(self):
+        return any(station.is_alive() for station in self.stations)
+
+    def stop(self):
+        for station in self.stations:
+            station.stop()
+        for station in self.stations:
+            station.join()  # Stations poll their stop flag while waiting for results
+            station.release_buffer()
+        self.stop_workers()
+
+    def stop_workers(self):
+        for task_queue in self.task_queues:
+            task_queue.put(None)
+        for worker in self.workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run several headless game stations on one host")
+    parser.add_argument("sources", nargs="+", help="one frame source per station: camera index, video file, image directory or 'synthetic'")
+    parser.add_argument("--workers", type=int, default=None, help="inference processes (default: one per core, at most one per station)")
+    parser.add_argument("--rounds", type=int, default=5, help="rounds per match")
+    parser.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between FPS reports")
+    parser.add_argument("--fast", action="store_true", help="replay recorded sources as fast as possible")
+    parser.add_argument("--loop", action="store_true", help="loop recorded sources")
+    parser.add_argument("--json", action="store_true", help="print reports as JSON lines")
+    args = parser.parse_args(argv)
+
+    sources = [create_frame_source(spec, realtime=not args.fast, loop=args.loop) for spec in args.sources]
+    manager = StationManager(sources, workers=args.workers, max_attempts=args.rounds)
+    try:
+        manager.start()
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    started = time.perf_counter()
+    try:
+        while manager.running():
+            time.sleep(args.interval)
+            stats = manager.stats()
+            if args.json:
+                print(json.dumps({"time": round(time.perf_counter() - started, 3), "stations": stats}), flush=True)
+            else:
+                for entry in stats:
+                    print(f"station {entry['station']}: capture {entry['capture_fps']:5.1f} FPS, "
+                          f"inference {entry['inference_fps']:5.1f} FPS, {entry['rounds']} rounds, "
+                          f"{entry['matches']} matches" + (f", error: {entry['error']}" if entry["error"] else ""))
+            if args.duration is not None and time.perf_counter() - started >= args.duration:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import threading
+from collections import deque
+
+import mediapipe as mp
+import numpy as np
+
+
+class LiveStreamHandLandmarker:
+    """MediaPipe Tasks HandLandmarker in LIVE_STREAM mode, usable as HandTrackingThread's inference_client.
+
+    submit() hands the frame to MediaPipe and returns at once; MediaPipe runs
+    the model on its own thread and reports through a callback, so the
+    tracking loop goes on with the next frame meanwhile. Frames MediaPipe
+    drops while busy never get a result and are skipped.
+    """
+
+    needs_local_model = False
+
+    def __init__(self, model_path="hand_landmarker.task", max_hands=1, max_in_flight=2, result_timeout=1.0):
+        self.model_path = model_path
+        self.max_hands = max_hands
+        self.max_in_flight = max_in_flight
+        self.result_timeout = result_timeout
+        self.landmarker = None
+        self.pending = deque()  # (timestamp ms, rgb frame, context) in submission order
+        self.results = {}  # timestamp ms -> hands, filled by the MediaPipe callback
+        self.skipped = 0
+        self.local_fallbacks = 0  # Part of the inference-client interface; never used here
+        self._last_timestamp = -1
+        self._cond = threading.Condition()
+
+    def load(self):
+        if self.landmarker is not None:
+            return
+        vision = mp.tasks.vision
+        options = vision.HandLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(model_asset_path=self.model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=self.max_hands,
+            min_hand_detection_confidence=0.7,
+            min_hand_presence_confidence=0.7,
+            min_tracking_confidence=0.7,
+            result_callback=self._on_result,
+        )
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+    def _on_result(self, result, image, timestamp_ms):
+        hands = [
+            (np.array([(landmark.x, landmark.y, landmark.z) for landmark in landmarks], dtype=np.float32),
+             handedness[0].category_name, handedness[0].score)
+            for landmarks, handedness in zip(result.hand_landmarks, result.handedness)
+        ]
+        with self._cond:
+            self.results[timestamp_ms] = hands
+            self._cond.notify_all()
+
+    def submit(self, rgb_frame, context=None):
+        captured_at = context[0] if context else 0.0
+        # Live-stream timestamps must strictly increase
+        timestamp_ms = max(int(captured_at * 1000), self._last_timestamp + 1)
+        self._last_timestamp = timestamp_ms
+        self.pending.append((timestamp_ms, rgb_frame, context))
+        self.landmarker.detect_async(mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame), timestamp_ms)
+
+    def completed(self, fallback=None):
+        """Returns (rgb frame, context, hands) for frames MediaPipe has answered, oldest first.
+
+        Waits for the oldest frame only once more than `max_in_flight` are outstanding.
+        """
+        done = []
+        with self._cond:
+            while self.pending:
+                timestamp_ms, rgb_frame, context = self.pending[0]
+                if timestamp_ms not in self.results:
+                    if any(later in self.results for later, _, _ in self.pending):
+                        pass  # A newer frame was answered, so MediaPipe dropped this one
+                    elif len(self.pending) <= self.max_in_flight:
+                        break
+                    elif not self._cond.wait_for(lambda: timestamp_ms in self.results, self.result_timeout):
+                        pass  # Dropped, or stuck: don't hold up the loop
+                self.pending.popleft()
+                hands = self.results.pop(timestamp_ms, None)
+                if hands is None:
+                    self.skipped += 1
+                    continue
+                done.append((rgb_frame, context, hands))
+            # Answers for frames that were discarded meanwhile
+            oldest = self.pending[0][0] if self.pending else self._last_timestamp + 1
+            for timestamp_ms in [timestamp_ms for timestamp_ms in self.results if timestamp_ms < oldest]:
+                del self.results[timestamp_ms]
+        return done
+
+    def discard(self):
+        with self._cond:
+            self.pending.clear()
+            self.results.clear()
+
+    def close(self):
+        self.discard()
+        if self.landmarker is not None:
+            self.landmarker.close()
+            self.landmarker = None
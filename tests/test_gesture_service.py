@@ -0,0 +1,80 @@
+import socket
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+requests = pytest.importorskip("requests")
+
+from gesture_service import GestureService, RemoteInferenceClient
+
+
+@pytest.fixture
+def service():
+    service = GestureService(port=0).start()  # Port 0: any free loopback port
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def silent_server():
+    """A listening socket that never answers, so every request times out."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(8)
+    yield "http://127.0.0.1:%d" % listener.getsockname()[1]
+    listener.close()
+
+
+def open_hand():
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[:, 0] = np.linspace(0.3, 0.7, 21)
+    points[0, 1] = 0.9  # Wrist at the bottom, everything else above it and extended
+    points[[2, 5, 9, 13, 17], 1] = 0.6
+    points[[4, 8, 12, 16, 20], 1] = 0.2
+    return points
+
+
+def test_classify_over_loopback(service):
+    client = RemoteInferenceClient(service.url)
+    try:
+        assert client.classify(open_hand()[None]) == ["Paper"]
+        assert client.classify(np.zeros((2, 21, 3), dtype=np.float32)) == [None, None]
+    finally:
+        client.close()
+
+
+def test_bad_requests(service):
+    response = requests.post(service.url + "/v1/landmarks", json={"landmarks": [[0.0, 0.0]]}, timeout=5)
+    assert response.status_code == 400
+    response = requests.post(service.url + "/v1/unknown", json={}, timeout=5)
+    assert response.status_code == 404
+
+
+def test_timeouts_fall_back_to_local_inference(silent_server):
+    client = RemoteInferenceClient(silent_server, timeout=0.05, max_in_flight=2)
+    local_hands = [(open_hand(), "Right", 1.0)]
+    fallback_frames = []
+
+    def fallback(rgb_frame):
+        fallback_frames.append(rgb_frame)
+        return local_hands
+
+    try:
+        frame = np.zeros((8, 8, 3), dtype=np.uint8)
+        done = []
+        for frame_id in range(1, 5):
+            client.submit(frame, (time.perf_counter(), frame_id))
+            done += client.completed(fallback)
+        deadline = time.monotonic() + 5.0
+        while client.pending and time.monotonic() < deadline:
+            time.sleep(0.05)
+            done += client.completed(fallback)
+    finally:
+        client.close()
+
+    assert [context[1] for _, context, _ in done] == [1, 2, 3, 4]
+    assert all(hands is local_hands for _, _, hands in done)
+    assert client.remote_failures >= 1
+    assert client.local_fallbacks == len(fallback_frames) == 4
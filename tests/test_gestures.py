@@ -0,0 +1,54 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from gestures import GESTURES, NO_GESTURE, classify_gesture, classify_gesture_codes
+
+
+def detect_gesture_reference(points):
+    """The per-landmark rules classify_gesture_codes replaced, ported from the old detect_gesture."""
+    x, y = points[:, 0].tolist(), points[:, 1].tolist()
+    thumb_tip, index_tip, middle_tip, ring_tip, pinky_tip = 4, 8, 12, 16, 20
+    thumb_mcp, index_mcp, middle_mcp, ring_mcp, pinky_mcp = 2, 5, 9, 13, 17
+    wrist = 0
+
+    index_middle_dist = math.sqrt((x[index_tip] - x[middle_tip]) ** 2 + (y[index_tip] - y[middle_tip]) ** 2)
+
+    index_finger_extended = y[index_tip] < y[index_mcp] and y[index_tip] < y[wrist]
+    middle_finger_extended = y[middle_tip] < y[middle_mcp] and y[middle_tip] < y[wrist]
+    ring_finger_extended = y[ring_tip] < y[ring_mcp] and y[ring_tip] < y[wrist]
+    pinky_finger_extended = y[pinky_tip] < y[pinky_mcp] and y[pinky_tip] < y[wrist]
+    thumb_extended = x[thumb_tip] > x[thumb_mcp] if x[thumb_tip] > x[thumb_mcp] else x[thumb_tip] < x[wrist]
+
+    if (y[thumb_tip] > y[thumb_mcp] and y[index_tip] > y[index_mcp] and y[middle_tip] > y[middle_mcp]
+            and y[ring_tip] > y[ring_mcp] and y[pinky_tip] > y[pinky_mcp]):
+        return "Rock"
+    elif (index_finger_extended and middle_finger_extended and ring_finger_extended and pinky_finger_extended
+          and thumb_extended and y[thumb_tip] < y[wrist]):
+        return "Paper"
+    elif (index_finger_extended and middle_finger_extended and not ring_finger_extended
+          and not pinky_finger_extended and index_middle_dist > 0.08):
+        return "Scissors"
+    return None
+
+
+def test_vectorized_rules_match_reference():
+    rng = np.random.default_rng(20240601)
+    landmarks = rng.random((200_000, 21, 3), dtype=np.float32)
+    codes = classify_gesture_codes(landmarks)
+    expected = [detect_gesture_reference(points) for points in landmarks]
+    labels = [GESTURES[code] if code != NO_GESTURE else None for code in codes.tolist()]
+    mismatches = [index for index, (got, want) in enumerate(zip(labels, expected)) if got != want]
+    assert not mismatches, f"{len(mismatches)} mismatches, first at {mismatches[0]}"
+    # Random landmarks must exercise every branch, or the comparison proves little
+    assert set(expected) == {"Rock", "Paper", "Scissors", None}
+
+
+def test_single_hand_matches_batch():
+    rng = np.random.default_rng(7)
+    landmarks = rng.random((100, 21, 3), dtype=np.float32)
+    codes = classify_gesture_codes(landmarks)
+    for points, code in zip(landmarks, codes.tolist()):
+        assert classify_gesture(points) == (GESTURES[code] if code != NO_GESTURE else None)
@@ -0,0 +1,52 @@
+import pytest
+
+from smoothing import GestureSmoother
+
+
+def feed(smoother, labels, fps, start=0.0):
+    """Feeds one vote per frame; returns (timestamp, emitted gesture) for every emission."""
+    emitted = []
+    for index, label in enumerate(labels):
+        timestamp = start + index / fps
+        gesture = smoother.update(label, 1.0, timestamp)
+        if gesture:
+            emitted.append((timestamp, gesture))
+    return emitted
+
+
+@pytest.mark.parametrize("fps", [15, 30, 60])
+def test_decision_time_independent_of_frame_rate(fps):
+    emitted = feed(GestureSmoother(), ["Rock"] * fps, fps)
+    # The first frame whose window spans min_span_ms (60 ms) decides: 66.7 ms at all three rates
+    assert emitted[0] == (pytest.approx(1 / 15, abs=1e-6), "Rock")
+    assert len(emitted) == 1
+
+
+def test_alternating_votes_do_not_flicker():
+    # The first 3-frame window is 2/3 Rock, which may settle once; after that neither label reaches enter_ratio
+    emitted = feed(GestureSmoother(), ["Rock", "Paper"] * 60, 30)
+    assert len(emitted) <= 1
+
+
+def test_no_flicker_once_stable():
+    smoother = GestureSmoother()
+    assert feed(smoother, ["Rock"] * 15, 30)
+    # Paper gets half of the votes: below enter_ratio for Paper, above exit_ratio for Rock
+    assert feed(smoother, ["Paper", "Rock"] * 30, 30, start=0.5) == []
+    assert smoother.stable == "Rock"
+
+
+def test_reemits_after_hand_leaves():
+    smoother = GestureSmoother()
+    assert [gesture for _, gesture in feed(smoother, ["Rock"] * 15, 30)] == ["Rock"]
+    feed(smoother, [None] * 15, 30, start=0.5)
+    assert smoother.stable is None
+    assert [gesture for _, gesture in feed(smoother, ["Rock"] * 15, 30, start=1.0)] == ["Rock"]
+
+
+def test_old_votes_leave_the_window():
+    smoother = GestureSmoother(window_ms=250)
+    feed(smoother, ["Rock"] * 15, 30)
+    feed(smoother, ["Paper"] * 15, 30, start=0.5)
+    assert smoother.share("Rock") == 0.0
+    assert smoother.stable == "Paper"
@@ -0,0 +1,108 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from game_core import CHOICES, OPPONENT, OUTCOMES, PLAYER
+
+
+# OUTCOME[player move, opponent move]: 1 player wins, -1 opponent wins, 0 tie. Moves index CHOICES.
+OUTCOME = np.array([[{PLAYER: 1, OPPONENT: -1}.get(OUTCOMES[(player, opponent)], 0) for opponent in CHOICES]
+                    for player in CHOICES], dtype=np.int8)
+
+
+def simulate_matches(player_moves, opponent_moves, best_of=False):
+    """Scores a (games, rounds) array of moves per side in one call.
+
+    Returns per-game arrays: player and opponent scores, rounds played and
+    the winner (1 player, -1 opponent, 0 tie). With best_of, a game stops
+    counting once the leader can no longer be caught, as GameState does.
+    """
+    outcomes = OUTCOME[player_moves, opponent_moves]
+    games, rounds = outcomes.shape
+    score_dtype = np.int16 if rounds < 2 ** 15 else np.int32
+    player_wins = np.cumsum(outcomes == 1, axis=1, dtype=score_dtype)
+    opponent_wins = np.cumsum(outcomes == -1, axis=1, dtype=score_dtype)
+
+    if best_of:
+        remaining = rounds - np.arange(1, rounds + 1, dtype=score_dtype)
+        decided = np.abs(player_wins - opponent_wins) > remaining
+        # Index of the first decisive round; the last round always decides
+        rounds_played = np.where(decided.any(axis=1), decided.argmax(axis=1) + 1, rounds)
+    else:
+        rounds_played = np.full(games, rounds)
+
+    rows = np.arange(games)
+    player_score = player_wins[rows, rounds_played - 1]
+    opponent_score = opponent_wins[rows, rounds_played - 1]
+    return {
+        "player_score": player_score,
+        "opponent_score": opponent_score,
+        "rounds_played": rounds_played,
+        "winner": np.sign(player_score.astype(np.int32) - opponent_score),
+    }
+
+
+def run_tournament(games, rounds, player_probabilities=None, opponent_probabilities=None, best_of=True,
+                   chunk_games=1 << 18, seed=None):
+    """Simulates `games` matches of up to `rounds` rounds between two players with fixed move probabilities.
+
+    Games are simulated in chunks of `chunk_games`, so memory stays bounded however many are asked for.
+    """
+    rng = np.random.default_rng(seed)
+    winners = np.zeros(3, dtype=np.int64)  # Opponent, tie, player
+    rounds_histogram = np.zeros(rounds + 1, dtype=np.int64)
+    started = time.perf_counter()
+    for start in range(0, games, chunk_games):
+        size = min(chunk_games, games - start)
+        player_moves = rng.choice(len(CHOICES), (size, rounds), p=player_probabilities).astype(np.int8)
+        opponent_moves = rng.choice(len(CHOICES), (size, rounds), p=opponent_probabilities).astype(np.int8)
+        result = simulate_matches(player_moves, opponent_moves, best_of)
+        winners += np.bincount(result["winner"] + 1, minlength=3)
+        rounds_histogram += np.bincount(result["rounds_played"], minlength=rounds + 1)
+    elapsed = time.perf_counter() - started
+    played = int((rounds_histogram * np.arange(rounds + 1)).sum())
+    return {
+        "games": games,
+        "player_win_rate": winners[2] / games,
+        "tie_rate": winners[1] / games,
+        "opponent_win_rate": winners[0] / games,
+        "mean_rounds": played / games,
+        "rounds_histogram": rounds_histogram.tolist(),
+        "rounds_per_second": games * rounds / elapsed if elapsed else float("inf"),
+    }
+
+
+def parse_probabilities(text):
+    if text is None:
+        return None
+    values = np.array([float(value) for value in text.split(",")])
+    if len(values) != len(CHOICES):
+        raise argparse.ArgumentTypeError("expected three comma-separated probabilities for rock, paper, scissors")
+    return values / values.sum()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many matches to tune match length")
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[3, 5, 7, 9], help="match lengths to compare")
+    parser.add_argument("--player", type=parse_probabilities, default=None,
+                        help="player's rock,paper,scissors probabilities (default uniform)")
+    parser.add_argument("--opponent", type=parse_probabilities, default=None,
+                        help="opponent's rock,paper,scissors probabilities (default uniform)")
+    parser.add_argument("--all-rounds", action="store_true", help="always play every round instead of best-of-N")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    print(f"{'rounds':>6} {'player':>8} {'tie':>8} {'opponent':>9} {'mean len':>9} {'rounds/s':>14}")
+    for rounds in args.rounds:
+        result = run_tournament(args.games, rounds, args.player, args.opponent, best_of=not args.all_rounds,
+                                seed=args.seed)
+        print(f"{rounds:>6} {result['player_win_rate']:8.1%} {result['tie_rate']:8.1%} "
+              f"{result['opponent_win_rate']:9.1%} {result['mean_rounds']:9.2f} {result['rounds_per_second']:14,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+
+TRACE_ENV = "RPS_TRACE"  # Set to a file path to trace without the --trace flag
+
+
+class Tracer:
+    """Collects span events from any thread and saves them in Chrome trace-event format.
+
+    Open the file in chrome://tracing or ui.perfetto.dev. Spans that belong to
+    one captured frame are linked by flow events keyed by the frame ID, so a
+    frame can be followed across the capture, tracking and GUI threads. While
+    disabled every call returns straight away.
+    """
+
+    def __init__(self, max_events=1_000_000):
+        self.enabled = False
+        self.path = None
+        self.max_events = max_events
+        self.events = []  # list.append is atomic, so threads add events without a lock
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self._thread_names = {}
+        self._saved = False
+
+    def start(self, path):
+        if self.enabled:
+            return
+        self.path = path
+        self.enabled = True
+        atexit.register(self.save)
+
+    def _timestamp(self, seconds):
+        # Trace timestamps are microseconds
+        return round((seconds - self.origin) * 1e6, 1)
+
+    def _add(self, event):
+        if len(self.events) >= self.max_events:
+            return
+        thread_id = threading.get_ident()
+        if thread_id not in self._thread_names:
+            self._thread_names[thread_id] = threading.current_thread().name
+        event["pid"] = self.pid
+        event["tid"] = thread_id
+        self.events.append(event)
+
+    def complete(self, name, start, end=None, frame_id=None, flow=None, flow_name="frame", **args):
+        """Records a span from `start` to `end` (perf_counter seconds, default now).
+
+        `flow` is "s", "t" or "f" to start, continue or finish the flow of `frame_id` at this span.
+        """
+        if not self.enabled:
+            return
+        if end is None:
+            end = time.perf_counter()
+        if frame_id is not None:
+            args["frame"] = frame_id
+        ts = self._timestamp(start)
+        self._add({"name": name, "cat": "pipeline", "ph": "X", "ts": ts,
+                   "dur": max(self._timestamp(end) - ts, 0.0), "args": args})
+        if flow and frame_id is not None and frame_id >= 0:
+            self._add({"name": flow_name, "cat": flow_name, "ph": flow, "id": frame_id, "ts": ts, "bp": "e"})
+
+    def save(self):
+        if not self.enabled or self._saved:
+            return
+        self._saved = True
+        metadata = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": thread_id, "args": {"name": name}}
+                    for thread_id, name in self._thread_names.items()]
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f)
+
+
+tracer = Tracer()
+if os.environ.get(TRACE_ENV):
+    tracer.start(os.environ[TRACE_ENV])